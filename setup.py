@@ -0,0 +1,33 @@
+"""Optional mypyc build for the scraping hot paths.
+
+Metadata lives in pyproject.toml. Setting SALES_LEAD_BUILDER_MYPYC=1 compiles
+site_scraper and site_selector to C extensions when mypy (mypyc) and a C
+toolchain are available; otherwise the pure-Python sources are installed.
+"""
+
+import os
+
+from setuptools import setup
+
+COMPILED_MODULES = [
+    "src/sales_lead_builder/site_scraper.py",
+    "src/sales_lead_builder/site_selector.py",
+]
+
+
+def _ext_modules():
+    if os.environ.get("SALES_LEAD_BUILDER_MYPYC", "").lower() not in {"1", "true", "yes"}:
+        return []
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print("SALES_LEAD_BUILDER_MYPYC is set but mypy is not installed; building pure-Python package")
+        return []
+    try:
+        return mypycify(["--ignore-missing-imports", *COMPILED_MODULES], opt_level="3")
+    except Exception as exc:  # pylint: disable=broad-except
+        print(f"mypyc compilation unavailable ({exc}); building pure-Python package")
+        return []
+
+
+setup(ext_modules=_ext_modules())
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence
+
+from .models import ReportResult
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(**parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class ReportCache:
+    path: Path
+    ttl_seconds: int
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, json TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS report_embeddings "
+                "(scope TEXT NOT NULL, embedding BLOB NOT NULL, json TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS report_embeddings_scope ON report_embeddings (scope)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[ReportResult]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT json, ts FROM reports WHERE key = ?", (key,)).fetchone()
+        if not row or self._expired(row[1]):
+            return None
+        return self._load(row[0])
+
+    def put(self, key: str, report: ReportResult) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (key, json, ts) VALUES (?, ?, ?)",
+                (key, self._dump(report), int(time.time())),
+            )
+
+    def find_similar(self, scope: str, embedding: List[float], threshold: float) -> Optional[ReportResult]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT embedding, json, ts FROM report_embeddings WHERE scope = ?", (scope,)
+            ).fetchall()
+        best_payload: Optional[str] = None
+        best_score = threshold
+        for blob, payload, ts in rows:
+            if self._expired(ts):
+                continue
+            stored = array("f")
+            stored.frombytes(blob)
+            score = _cosine_similarity(embedding, stored)
+            if score >= best_score:
+                best_payload, best_score = payload, score
+        if best_payload is None:
+            return None
+        logger.debug("Semantic cache hit for %s (similarity %.3f)", scope, best_score)
+        return self._load(best_payload)
+
+    def put_embedding(self, scope: str, embedding: List[float], report: ReportResult) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO report_embeddings (scope, embedding, json, ts) VALUES (?, ?, ?, ?)",
+                (scope, array("f", embedding).tobytes(), self._dump(report), int(time.time())),
+            )
+
+    def _expired(self, ts: int) -> bool:
+        return bool(self.ttl_seconds) and time.time() - ts > self.ttl_seconds
+
+    @staticmethod
+    def _dump(report: ReportResult) -> str:
+        return json.dumps(asdict(report), ensure_ascii=False)
+
+    @staticmethod
+    def _load(payload: str) -> Optional[ReportResult]:
+        try:
+            return ReportResult(**json.loads(payload))
+        except (TypeError, ValueError):
+            logger.warning("Discarding corrupt report cache entry")
+            return None
+
+
+def _cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
+    if len(left) != len(right):
+        return 0.0
+    dot = sum(a * b for a, b in zip(left, right))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return dot / norm if norm else 0.0
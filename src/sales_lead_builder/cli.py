@@ -7,7 +7,6 @@ from typing import Optional
 import typer
 
 from .config import get_settings
-from .models import CompanyRow
 from .processor import LeadProcessor
 
 logging.basicConfig(level=logging.INFO)
@@ -42,33 +41,39 @@ def run(
 def _process_single_row(processor: LeadProcessor, row_number: int) -> None:
     if row_number < 2:
         raise typer.BadParameter("ヘッダーを除く2行目以降を指定してください")
-    rows = processor.sheets.fetch_rows(start_row=row_number)
-    if not rows:
+    row = processor.sheets.fetch_row(row_number)
+    if row is None:
         typer.echo(f"行{row_number}はデータがありません")
         return
-    row = rows[0]
     outcome = processor.process_row(row)
     _print_outcomes([outcome])
 
 
 def _process_by_company(processor: LeadProcessor, company: str) -> None:
-    rows = processor.sheets.fetch_rows()
-    matches = [row for row in rows if row.company_name == company]
-    if not matches:
+    names = processor.sheets.fetch_company_names()
+    try:
+        offset = names.index(company)
+    except ValueError:
         typer.echo(f"会社名 '{company}' は見つかりませんでした")
         raise typer.Exit(code=1)
-    outcome = processor.process_row(matches[0])
+    row = processor.sheets.fetch_row(offset + 2)
+    if row is None:
+        typer.echo(f"会社名 '{company}' は見つかりませんでした")
+        raise typer.Exit(code=1)
+    outcome = processor.process_row(row)
     _print_outcomes([outcome])
 
 
 def _print_outcomes(outcomes) -> None:
+    lines = []
     for outcome in outcomes:
         row = outcome.row
-        typer.echo(
-            f"行{row.row_index + 1} {row.company_name}: status={outcome.updates.get('status')}"
-        )
-        if outcome.updates.get("error_detail"):
-            typer.echo(f"  error_detail: {outcome.updates['error_detail']}")
+        lines.append(f"行{row.row_index + 1} {row.company_name}: status={outcome.updates.get('status')}")
+        error_detail = outcome.updates.get("error_detail")
+        if error_detail:
+            lines.append(f"  error_detail: {error_detail}")
+    if lines:
+        typer.echo("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import cache
 from typing import Optional
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DEFAULT_LLM_CACHE_PATH = "~/.cache/sales_lead_builder/llm_cache.sqlite3"
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0.0.0 Safari/537.36"
+)
+_TRUTHY_VALUES = frozenset({"1", "true", "yes"})
+
 
 @dataclass(slots=True)
 class Settings:
@@ -26,50 +35,60 @@ class Settings:
     max_search_results: int = 5
     crawler_max_pages: int = 6
     crawler_max_depth: int = 2
-    user_agent: str = field(
-        default="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/126.0.0.0 Safari/537.36"
-    )
+    crawler_concurrency: int = 4
+    max_html_bytes: int = 2_000_000
+    max_workers: int = 4
+    user_agent: str = DEFAULT_USER_AGENT
     llm_model: str = "gpt-4o-mini"
     llm_temperature: float = 0.1
     llm_top_p: float = 0.9
+    llm_cache_path: Optional[str] = DEFAULT_LLM_CACHE_PATH
+    llm_cache_ttl: int = 7 * 24 * 3600
+    semantic_cache_threshold: float = 0.0
+    embedding_model: str = "text-embedding-3-small"
+    llm_batch_mode: bool = False
+    llm_batch_poll_interval: int = 60
     dry_run: bool = False
 
     @classmethod
     def from_env(cls) -> "Settings":
-        spreadsheet_id = os.getenv("SALES_LEAD_SPREADSHEET_ID")
+        spreadsheet_id = os.environ.get("SALES_LEAD_SPREADSHEET_ID")
         if not spreadsheet_id:
             raise ValueError("Environment variable SALES_LEAD_SPREADSHEET_ID is required")
 
         return cls(
             spreadsheet_id=spreadsheet_id,
-            main_sheet_name=os.getenv("SALES_LEAD_MAIN_SHEET", "prospects"),
-            log_sheet_name=os.getenv("SALES_LEAD_LOG_SHEET", "_logs"),
-            google_service_account_file=os.getenv("SALES_LEAD_GCP_SERVICE_ACCOUNT"),
-            google_subject=os.getenv("SALES_LEAD_GCP_SUBJECT"),
-            search_provider=os.getenv("SALES_LEAD_SEARCH_PROVIDER", "tavily"),
-            tavily_api_key=os.getenv("TAVILY_API_KEY"),
-            bing_api_key=os.getenv("BING_SEARCH_API_KEY"),
-            google_search_api_key=os.getenv("GOOGLE_SEARCH_API_KEY"),
-            google_search_cx=os.getenv("GOOGLE_SEARCH_CX"),
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            request_timeout=int(os.getenv("SALES_LEAD_REQUEST_TIMEOUT", "15")),
-            max_search_results=int(os.getenv("SALES_LEAD_MAX_SEARCH_RESULTS", "5")),
-            crawler_max_pages=int(os.getenv("SALES_LEAD_MAX_PAGES", "6")),
-            crawler_max_depth=int(os.getenv("SALES_LEAD_MAX_DEPTH", "2")),
-            user_agent=os.getenv(
-                "SALES_LEAD_USER_AGENT",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/126.0.0.0 Safari/537.36",
-            ),
-            llm_model=os.getenv("SALES_LEAD_LLM_MODEL", "gpt-4o-mini"),
-            llm_temperature=float(os.getenv("SALES_LEAD_LLM_TEMPERATURE", "0.1")),
-            llm_top_p=float(os.getenv("SALES_LEAD_LLM_TOP_P", "0.9")),
-            dry_run=os.getenv("SALES_LEAD_DRY_RUN", "false").lower() in {"1", "true", "yes"},
+            main_sheet_name=os.environ.get("SALES_LEAD_MAIN_SHEET", "prospects"),
+            log_sheet_name=os.environ.get("SALES_LEAD_LOG_SHEET", "_logs"),
+            google_service_account_file=os.environ.get("SALES_LEAD_GCP_SERVICE_ACCOUNT"),
+            google_subject=os.environ.get("SALES_LEAD_GCP_SUBJECT"),
+            search_provider=os.environ.get("SALES_LEAD_SEARCH_PROVIDER", "tavily"),
+            tavily_api_key=os.environ.get("TAVILY_API_KEY"),
+            bing_api_key=os.environ.get("BING_SEARCH_API_KEY"),
+            google_search_api_key=os.environ.get("GOOGLE_SEARCH_API_KEY"),
+            google_search_cx=os.environ.get("GOOGLE_SEARCH_CX"),
+            openai_api_key=os.environ.get("OPENAI_API_KEY"),
+            request_timeout=int(os.environ.get("SALES_LEAD_REQUEST_TIMEOUT", "15")),
+            max_search_results=int(os.environ.get("SALES_LEAD_MAX_SEARCH_RESULTS", "5")),
+            crawler_max_pages=int(os.environ.get("SALES_LEAD_MAX_PAGES", "6")),
+            crawler_max_depth=int(os.environ.get("SALES_LEAD_MAX_DEPTH", "2")),
+            crawler_concurrency=int(os.environ.get("SALES_LEAD_CRAWLER_CONCURRENCY", "4")),
+            max_html_bytes=int(os.environ.get("SALES_LEAD_MAX_HTML_BYTES", "2000000")),
+            max_workers=int(os.environ.get("SALES_LEAD_MAX_WORKERS", "4")),
+            user_agent=os.environ.get("SALES_LEAD_USER_AGENT", DEFAULT_USER_AGENT),
+            llm_model=os.environ.get("SALES_LEAD_LLM_MODEL", "gpt-4o-mini"),
+            llm_temperature=float(os.environ.get("SALES_LEAD_LLM_TEMPERATURE", "0.1")),
+            llm_top_p=float(os.environ.get("SALES_LEAD_LLM_TOP_P", "0.9")),
+            llm_cache_path=os.environ.get("SALES_LEAD_LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH) or None,
+            llm_cache_ttl=int(os.environ.get("SALES_LEAD_LLM_CACHE_TTL", "604800")),
+            semantic_cache_threshold=float(os.environ.get("SALES_LEAD_SEMANTIC_CACHE_THRESHOLD", "0")),
+            embedding_model=os.environ.get("SALES_LEAD_EMBEDDING_MODEL", "text-embedding-3-small"),
+            llm_batch_mode=os.environ.get("SALES_LEAD_LLM_BATCH", "false").lower() in _TRUTHY_VALUES,
+            llm_batch_poll_interval=int(os.environ.get("SALES_LEAD_LLM_BATCH_POLL_INTERVAL", "60")),
+            dry_run=os.environ.get("SALES_LEAD_DRY_RUN", "false").lower() in _TRUTHY_VALUES,
         )
 
 
+@cache
 def get_settings() -> Settings:
     return Settings.from_env()
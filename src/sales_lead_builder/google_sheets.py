@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
 from google.auth import default
 from google.oauth2.service_account import Credentials
@@ -10,34 +12,45 @@ from googleapiclient.errors import HttpError
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from .config import Settings
-from .models import CompanyRow, LogEntry, SHEET_COLUMNS
+from .models import CompanyRow, LogEntry, SHEET_COLUMN_ORDER, SHEET_COLUMNS
 
 SHEETS_SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
 ]
 
+# Columns owned by the sales team; the tool never writes them.
+READ_ONLY_FIELDS = {"company_name", "lock_manual_override"}
+
+
+def _file_mtime(path: Optional[str]) -> Optional[float]:
+    if not path:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _build_service(service_account_file: Optional[str], subject: Optional[str], mtime: Optional[float]):
+    # mtime is part of the cache key so a rotated key file is picked up without a restart.
+    if service_account_file:
+        credentials = Credentials.from_service_account_file(service_account_file, scopes=SHEETS_SCOPES)
+        if subject:
+            credentials = credentials.with_subject(subject)
+    else:
+        credentials, _ = default(scopes=SHEETS_SCOPES)
+    return build("sheets", "v4", credentials=credentials, cache_discovery=False, static_discovery=True)
+
 
 @dataclass(slots=True)
 class SheetsClient:
     settings: Settings
-    _credentials: object = field(init=False, repr=False)
     _service: object = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        self._credentials = self._build_credentials()
-        self._service = build("sheets", "v4", credentials=self._credentials, cache_discovery=False)
-
-    def _build_credentials(self):
-        if self.settings.google_service_account_file:
-            credentials = Credentials.from_service_account_file(
-                self.settings.google_service_account_file,
-                scopes=SHEETS_SCOPES,
-            )
-            if self.settings.google_subject:
-                credentials = credentials.with_subject(self.settings.google_subject)
-            return credentials
-        credentials, _ = default(scopes=SHEETS_SCOPES)
-        return credentials
+        account_file = self.settings.google_service_account_file
+        self._service = _build_service(account_file, self.settings.google_subject, _file_mtime(account_file))
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
     def fetch_rows(self, start_row: int = 2) -> List[CompanyRow]:
@@ -49,23 +62,43 @@ class SheetsClient:
             .execute()
         )
         values: List[List[str]] = response.get("values", [])
-        rows: List[CompanyRow] = []
-        for offset, raw in enumerate(values):
-            row_index = start_row - 1 + offset
-            rows.append(CompanyRow.from_row(row_index=row_index, row_values=raw))
-        return rows
+        return CompanyRow.from_rows(start_row - 1, values)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
+    def fetch_row(self, row_number: int) -> Optional[CompanyRow]:
+        sheet_range = f"{self.settings.main_sheet_name}!A{row_number}:V{row_number}"
+        response = (
+            self._service.spreadsheets()
+            .values()
+            .get(spreadsheetId=self.settings.spreadsheet_id, range=sheet_range)
+            .execute()
+        )
+        values: List[List[str]] = response.get("values", [])
+        if not values:
+            return None
+        return CompanyRow.from_row(row_index=row_number - 1, row_values=values[0])
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
+    def fetch_company_names(self, start_row: int = 2) -> List[str]:
+        sheet_range = f"{self.settings.main_sheet_name}!A{start_row}:A"
+        response = (
+            self._service.spreadsheets()
+            .values()
+            .get(spreadsheetId=self.settings.spreadsheet_id, range=sheet_range)
+            .execute()
+        )
+        return [(cells[0].strip() if cells else "") for cells in response.get("values", [])]
+
     def update_row(self, row: CompanyRow, updates: dict[str, Optional[str]]) -> None:
-        filtered = {k: v for k, v in updates.items() if k in SHEET_COLUMNS and k != "lock_manual_override"}
-        if not filtered:
-            return
-        row_number = row.row_index + 1
+        self.update_rows([(row, updates)])
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
+    def update_rows(self, items: List[Tuple[CompanyRow, dict[str, Optional[str]]]]) -> None:
         data = []
-        for field, value in filtered.items():
-            column = SHEET_COLUMNS[field]
-            range_name = f"{self.settings.main_sheet_name}!{column}{row_number}"
-            data.append({"range": range_name, "values": [[value or "" ]]})
+        for row, updates in items:
+            data.extend(self._row_value_ranges(row, updates))
+        if not data:
+            return
         body = {"valueInputOption": "USER_ENTERED", "data": data}
         (
             self._service.spreadsheets()
@@ -74,6 +107,23 @@ class SheetsClient:
             .execute()
         )
 
+    def _row_value_ranges(self, row: CompanyRow, updates: dict[str, Optional[str]]) -> List[dict]:
+        # One range per run of adjacent updated columns; cells outside `updates` are never written,
+        # so formulas and edits made after the fetch are left alone.
+        row_number = row.row_index + 1
+        data = []
+        run: List[str] = []
+        for name in (*SHEET_COLUMN_ORDER, None):
+            if name is not None and name in updates and name not in READ_ONLY_FIELDS:
+                run.append(name)
+                continue
+            if run:
+                first, last = SHEET_COLUMNS[run[0]], SHEET_COLUMNS[run[-1]]
+                range_name = f"{self.settings.main_sheet_name}!{first}{row_number}:{last}{row_number}"
+                data.append({"range": range_name, "values": [[updates[column] or "" for column in run]]})
+                run = []
+        return data
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
     def append_log(self, entries: Iterable[LogEntry]) -> None:
         rows = [entry.to_row() for entry in entries]
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 SHEET_COLUMNS: Dict[str, str] = {
@@ -31,6 +32,24 @@ SHEET_COLUMNS: Dict[str, str] = {
 }
 
 
+SHEET_COLUMN_ORDER: Tuple[str, ...] = tuple(SHEET_COLUMNS)
+_N_COLUMNS = len(SHEET_COLUMN_ORDER)
+_SHEET_COLUMN_SET = frozenset(SHEET_COLUMNS)
+_LOCK_INDEX = SHEET_COLUMN_ORDER.index("lock_manual_override")
+_TRUTHY_VALUES = frozenset({"true", "1", "yes", "y", "t"})
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _clean_cell(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    cleaned = str(value).strip()
+    return cleaned or None
+
+
 REPORT_FIELDS = [
     "business_summary",
     "business_bullets",
@@ -67,53 +86,25 @@ class CompanyRow:
 
     @classmethod
     def from_row(cls, row_index: int, row_values: Iterable[str]) -> "CompanyRow":
-        values = list(row_values)
-        full_row: List[Optional[str]] = list(values) + [None] * (len(SHEET_COLUMNS) - len(values))
-        mapping = list(SHEET_COLUMNS.keys())
-        data: Dict[str, Optional[str]] = {
-            mapping[i]: full_row[i] if i < len(full_row) else None for i in range(len(mapping))
-        }
+        # Dataclass fields after row_index follow SHEET_COLUMNS order, so cells map positionally.
+        cells: List[Any] = [_clean_cell(value) for value in islice(row_values, _N_COLUMNS)]
+        cells.extend([None] * (_N_COLUMNS - len(cells)))
+        cells[0] = cells[0] or ""
+        lock_value = cells[_LOCK_INDEX]
+        cells[_LOCK_INDEX] = bool(lock_value) and lock_value.lower() in _TRUTHY_VALUES
+        return cls(row_index, *cells)
 
-        def _clean(value: Optional[str]) -> Optional[str]:
-            if value is None:
-                return None
-            cleaned = str(value).strip()
-            return cleaned or None
-
-        lock_value = data.get("lock_manual_override") or ""
-        return cls(
-            row_index=row_index,
-            company_name=_clean(data.get("company_name")) or "",
-            resolved_domain=_clean(data.get("resolved_domain")),
-            website_url=_clean(data.get("website_url")),
-            contact_form_url=_clean(data.get("contact_form_url")),
-            email_main=_clean(data.get("email_main")),
-            email_role_based=_clean(data.get("email_role_based")),
-            email_guessed=_clean(data.get("email_guessed")),
-            phone_main=_clean(data.get("phone_main")),
-            fax_main=_clean(data.get("fax_main")),
-            sns_linkedin=_clean(data.get("sns_linkedin")),
-            sns_x=_clean(data.get("sns_x")),
-            sns_instagram=_clean(data.get("sns_instagram")),
-            sns_facebook=_clean(data.get("sns_facebook")),
-            evidence_sources=_clean(data.get("evidence_sources")),
-            business_summary=_clean(data.get("business_summary")),
-            business_bullets=_clean(data.get("business_bullets")),
-            recent_news=_clean(data.get("recent_news")),
-            competitors_hint=_clean(data.get("competitors_hint")),
-            last_checked_at=_clean(data.get("last_checked_at")),
-            lock_manual_override=lock_value.strip().lower() in {"true", "1", "yes"},
-            status=_clean(data.get("status")),
-            error_detail=_clean(data.get("error_detail")),
-        )
+    @classmethod
+    def from_rows(cls, first_row_index: int, rows: Iterable[Iterable[str]]) -> List["CompanyRow"]:
+        from_row = cls.from_row
+        return [from_row(first_row_index + offset, raw) for offset, raw in enumerate(rows)]
 
     def to_update_payload(self, updates: Dict[str, Optional[str]]) -> Dict[str, str]:
-        payload: Dict[str, str] = {}
-        for field, value in updates.items():
-            if field not in SHEET_COLUMNS:
-                continue
-            payload[field] = value or ""
-        payload.setdefault("last_checked_at", datetime.now(timezone.utc).isoformat())
+        payload: Dict[str, str] = {
+            field: value or "" for field, value in updates.items() if field in _SHEET_COLUMN_SET
+        }
+        if "last_checked_at" not in payload:
+            payload["last_checked_at"] = _utc_now_iso()
         return payload
 
 
@@ -123,10 +114,11 @@ class LogEntry:
     message: str
     target_url: Optional[str] = None
     status: str = "info"
+    timestamp: str = field(default_factory=_utc_now_iso)
 
     def to_row(self) -> List[str]:
         return [
-            datetime.now(timezone.utc).isoformat(),
+            self.timestamp,
             self.stage,
             self.status,
             self.message,
@@ -147,6 +139,8 @@ class PageContent:
     url: str
     html: str
     text: str
+    soup: Any = field(default=None, repr=False, compare=False)  # parsed BeautifulSoup tree, reused by extractors
+    anchors: Any = field(default=None, repr=False, compare=False)  # (label, href, abs_url) per <a href>, lowercased label/href
 
 
 @dataclass(slots=True)
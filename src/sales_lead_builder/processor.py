@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
-from urllib.parse import urlparse
+from typing import Dict, Iterable, List, Optional, Union
 
 from .config import Settings
 from .google_sheets import SheetsClient
-from .models import CompanyRow, ExtractionResult, LogEntry
-from .reporting import ReportGenerator
+from .models import CompanyRow, ExtractionResult, LogEntry, SearchResult
+from .reporting import ReportGenerator, ReportRequest
 from .search_client import SearchClient, SearchClientError
 from .site_scraper import SiteCrawler, extract_contact_info, pick_best_domain
 from .site_selector import OfficialSiteSelector
@@ -19,6 +19,9 @@ STATUS_PENDING = "pending"
 STATUS_OK = "ok"
 STATUS_REVIEW = "needs_review"
 STATUS_ERROR = "error"
+REPROCESSABLE_STATUSES = frozenset({STATUS_PENDING, STATUS_REVIEW, STATUS_ERROR})
+
+SHEET_WRITE_BATCH_SIZE = 50
 
 
 @dataclass(slots=True)
@@ -28,6 +31,16 @@ class ProcessOutcome:
     logs: List[LogEntry]
 
 
+@dataclass(slots=True)
+class RowResearch:
+    row: CompanyRow
+    logs: List[LogEntry]
+    official_url: str
+    resolved_domain: str
+    extraction: ExtractionResult
+    report_request: Optional[ReportRequest] = None
+
+
 @dataclass(slots=True)
 class LeadProcessor:
     settings: Settings
@@ -36,6 +49,7 @@ class LeadProcessor:
     selector: OfficialSiteSelector = field(init=False, repr=False)
     crawler: SiteCrawler = field(init=False, repr=False)
     report_generator: Optional[ReportGenerator] = field(init=False, repr=False)
+    _news_cache: Dict[str, List[SearchResult]] = field(init=False, repr=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         self.sheets = SheetsClient(self.settings)
@@ -50,77 +64,153 @@ class LeadProcessor:
             self.report_generator = None
 
     def process_sheet(self, force: bool = False, limit: Optional[int] = None) -> List[ProcessOutcome]:
-        rows = self.sheets.fetch_rows()
+        should_process = self._should_process
+        rows = [row for row in self.sheets.fetch_rows() if should_process(row, force)]
+        if limit:
+            rows = rows[:limit]
+        settings = self.settings
+        write_outcomes = self._write_outcomes
         outcomes: List[ProcessOutcome] = []
-        for row in rows:
-            if not row.company_name:
-                continue
-            if row.lock_manual_override:
-                logger.info("Row %s locked; skipping", row.row_index + 1)
-                continue
-            if not force and row.status and row.status not in {STATUS_PENDING, STATUS_REVIEW, STATUS_ERROR}:
-                continue
-            outcome = self.process_row(row)
-            outcomes.append(outcome)
-            if limit and len(outcomes) >= limit:
-                break
+        pending: List[ProcessOutcome] = []
+        with ThreadPoolExecutor(max_workers=max(1, settings.max_workers)) as executor:
+            if settings.llm_batch_mode and self.report_generator:
+                outcomes = self._run_rows_batched(rows, executor)
+                for start in range(0, len(outcomes), SHEET_WRITE_BATCH_SIZE):
+                    write_outcomes(outcomes[start : start + SHEET_WRITE_BATCH_SIZE])
+                return outcomes
+            for outcome in executor.map(self._run_row, rows):
+                outcomes.append(outcome)
+                pending.append(outcome)
+                if len(pending) >= SHEET_WRITE_BATCH_SIZE:
+                    write_outcomes(pending)
+                    pending = []
+        write_outcomes(pending)
         return outcomes
 
+    @staticmethod
+    def _should_process(row: CompanyRow, force: bool) -> bool:
+        if not row.company_name:
+            return False
+        if row.lock_manual_override:
+            logger.info("Row %s locked; skipping", row.row_index + 1)
+            return False
+        if not force and row.status and row.status not in REPROCESSABLE_STATUSES:
+            return False
+        return True
+
     def process_row(self, row: CompanyRow) -> ProcessOutcome:
+        outcome = self._run_row(row)
+        self._write_outcomes([outcome])
+        return outcome
+
+    def _write_outcomes(self, outcomes: List[ProcessOutcome]) -> None:
+        if self.settings.dry_run or not outcomes:
+            return
+        self.sheets.update_rows([(outcome.row, outcome.updates) for outcome in outcomes])
+        self.sheets.append_log([entry for outcome in outcomes for entry in outcome.logs])
+
+    def _run_row(self, row: CompanyRow) -> ProcessOutcome:
         logs: List[LogEntry] = []
         try:
-            logger.info("Processing row %s: %s", row.row_index + 1, row.company_name)
-            logs.append(LogEntry(stage="start", message=f"Processing {row.company_name}"))
-            search_results = self._search_official_site(row.company_name)
-            logs.append(LogEntry(stage="search", message=f"{len(search_results)} results"))
-
-            candidate = self.selector.select(row.company_name, search_results)
-            if not candidate or not candidate.page:
-                raise RuntimeError("公式サイトを特定できませんでした")
-            official_url = candidate.page.url
-            resolved_domain = pick_best_domain(official_url)
-            logs.append(LogEntry(stage="official_site", message=official_url, target_url=official_url))
-
-            pages = self.crawler.crawl(official_url)
-            extraction = extract_contact_info(pages, official_url)
-            logs.append(LogEntry(stage="extract", message="contact info extracted", target_url=official_url))
-
+            research = self._research_row(row, logs)
             report = None
-            if self.report_generator:
-                snippets = [page.text[:1500] for page in pages[:3]]
-                news_candidates = self._search_official_news(row.company_name, resolved_domain)
+            if self.report_generator and research.report_request:
+                request = research.report_request
                 report = self.report_generator.generate(
-                    company_name=row.company_name,
-                    official_url=official_url,
-                    content_samples=snippets,
-                    news_candidates=news_candidates,
+                    company_name=request.company_name,
+                    official_url=request.official_url,
+                    content_samples=request.content_samples,
+                    news_candidates=request.news_candidates,
                 )
                 logs.append(LogEntry(stage="report", message="LLM report generated"))
+            return self._complete_row(research, report)
+        except Exception as exc:  # pylint: disable=broad-except
+            return self._failed_outcome(row, exc, logs)
 
-            updates = self._prepare_updates(row, official_url, resolved_domain, extraction, report)
-            status = updates.get("status")
-            if status == STATUS_ERROR:
-                logs.append(LogEntry(stage="error", message=updates.get("error_detail", ""), status="error"))
-            else:
-                logs.append(LogEntry(stage="complete", message=status or STATUS_OK))
-
-            if not self.settings.dry_run:
-                self.sheets.update_row(row, updates)
-                self.sheets.append_log(logs)
-            return ProcessOutcome(row=row, updates=updates, logs=logs)
+    def _run_rows_batched(self, rows: List[CompanyRow], executor: ThreadPoolExecutor) -> List[ProcessOutcome]:
+        staged = list(executor.map(self._stage_row, rows))
+        requests = {
+            str(item.row.row_index): item.report_request
+            for item in staged
+            if isinstance(item, RowResearch) and item.report_request
+        }
+        reports = self.report_generator.generate_many(requests) if requests else {}
+        outcomes: List[ProcessOutcome] = []
+        for item in staged:
+            if isinstance(item, ProcessOutcome):
+                outcomes.append(item)
+                continue
+            report = reports.get(str(item.row.row_index))
+            if report:
+                item.logs.append(LogEntry(stage="report", message="LLM report generated (batch)"))
+            try:
+                outcomes.append(self._complete_row(item, report))
+            except Exception as exc:  # pylint: disable=broad-except
+                outcomes.append(self._failed_outcome(item.row, exc, item.logs))
+        return outcomes
+
+    def _stage_row(self, row: CompanyRow) -> Union[RowResearch, ProcessOutcome]:
+        logs: List[LogEntry] = []
+        try:
+            return self._research_row(row, logs)
         except Exception as exc:  # pylint: disable=broad-except
-            logger.exception("Failed to process row %s", row.row_index + 1)
-            error_updates = row.to_update_payload(
-                {
-                    "status": STATUS_ERROR,
-                    "error_detail": str(exc),
-                }
+            return self._failed_outcome(row, exc, logs)
+
+    def _research_row(self, row: CompanyRow, logs: List[LogEntry]) -> RowResearch:
+        logger.info("Processing row %s: %s", row.row_index + 1, row.company_name)
+        logs.append(LogEntry(stage="start", message=f"Processing {row.company_name}"))
+        search_results = self._search_official_site(row.company_name)
+        logs.append(LogEntry(stage="search", message=f"{len(search_results)} results"))
+
+        candidate = self.selector.select(row.company_name, search_results)
+        if not candidate or not candidate.page:
+            raise RuntimeError("公式サイトを特定できませんでした")
+        official_url = candidate.page.url
+        resolved_domain = pick_best_domain(official_url)
+        logs.append(LogEntry(stage="official_site", message=official_url, target_url=official_url))
+
+        pages = self.crawler.crawl(official_url)
+        extraction = extract_contact_info(pages, official_url)
+        logs.append(LogEntry(stage="extract", message="contact info extracted", target_url=official_url))
+
+        research = RowResearch(
+            row=row,
+            logs=logs,
+            official_url=official_url,
+            resolved_domain=resolved_domain,
+            extraction=extraction,
+        )
+        if self.report_generator:
+            research.report_request = ReportRequest(
+                company_name=row.company_name,
+                official_url=official_url,
+                content_samples=[page.text[:1500] for page in pages[:3]],
+                news_candidates=self._search_official_news(row.company_name, resolved_domain),
             )
-            if not self.settings.dry_run:
-                self.sheets.update_row(row, error_updates)
-                logs.append(LogEntry(stage="exception", message=str(exc), status="error"))
-                self.sheets.append_log(logs)
-            return ProcessOutcome(row=row, updates=error_updates, logs=logs)
+        return research
+
+    def _complete_row(self, research: RowResearch, report) -> ProcessOutcome:
+        row, logs = research.row, research.logs
+        updates = self._prepare_updates(
+            row, research.official_url, research.resolved_domain, research.extraction, report
+        )
+        status = updates.get("status")
+        if status == STATUS_ERROR:
+            logs.append(LogEntry(stage="error", message=updates.get("error_detail", ""), status="error"))
+        else:
+            logs.append(LogEntry(stage="complete", message=status or STATUS_OK))
+        return ProcessOutcome(row=row, updates=updates, logs=logs)
+
+    def _failed_outcome(self, row: CompanyRow, exc: Exception, logs: List[LogEntry]) -> ProcessOutcome:
+        logger.error("Failed to process row %s", row.row_index + 1, exc_info=exc)
+        error_updates = row.to_update_payload(
+            {
+                "status": STATUS_ERROR,
+                "error_detail": str(exc),
+            }
+        )
+        logs.append(LogEntry(stage="exception", message=str(exc), status="error"))
+        return ProcessOutcome(row=row, updates=error_updates, logs=logs)
 
     def _search_official_site(self, company_name: str):
         try:
@@ -129,14 +219,19 @@ class LeadProcessor:
             raise RuntimeError("検索に失敗しました") from exc
 
     def _search_official_news(self, company_name: str, domain: str):
-        try:
-            results = self.search.search_company_news(company_name)
-        except SearchClientError:
-            return []
+        results = self._news_cache.get(company_name)
+        if results is None:
+            try:
+                results = self.search.search_company_news(company_name)
+            except SearchClientError:
+                return []
+            self._news_cache[company_name] = results
+        domain = domain.lower()
+        suffix = "." + domain
         filtered = []
         for result in results:
-            parsed = urlparse(result.url)
-            if parsed.netloc.endswith(domain):
+            host = _url_host(result.url)
+            if host == domain or host.endswith(suffix):
                 filtered.append(result)
         return filtered
 
@@ -148,11 +243,7 @@ class LeadProcessor:
         extraction: ExtractionResult,
         report,
     ) -> dict[str, Optional[str]]:
-        evidence_sources: List[str] = []
-        if extraction.evidence_sources:
-            evidence_sources.extend(extraction.evidence_sources)
-        evidence_sources.append(official_url)
-        evidence_str = "|".join(sorted(set(evidence_sources)))
+        evidence_str = "|".join(dict.fromkeys([*extraction.evidence_sources, official_url]))
 
         updates = {
             "resolved_domain": resolved_domain,
@@ -185,8 +276,10 @@ class LeadProcessor:
                     "competitors_hint": ";".join(report.competitors_hint) if report.competitors_hint else None,
                 }
             )
-        else:
+        elif self.report_generator is None:
             review_reasons.append("レポート未生成: OPENAI_API_KEY 未設定")
+        else:
+            review_reasons.append("レポート未生成")
 
         if not extraction.email_main:
             review_reasons.append("メールアドレス未取得")
@@ -198,3 +291,9 @@ class LeadProcessor:
             updates["error_detail"] = "; ".join(review_reasons)
 
         return row.to_update_payload(updates)
+
+
+def _url_host(url: str) -> str:
+    # "scheme://host/path" -> "host"; cheaper than urlparse for a plain host comparison.
+    parts = url.split("/", 3)
+    return parts[2].lower() if len(parts) > 2 else ""
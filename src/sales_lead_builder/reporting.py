@@ -1,27 +1,69 @@
 from __future__ import annotations
 
-import json
 import logging
+import time
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
 
+import orjson
 from openai import OpenAI, OpenAIError
 
+from .cache import ReportCache, make_cache_key
 from .config import Settings
 from .models import ReportResult, SearchResult
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "あなたは日本語で企業情報の要約を作成するアシスタントです。"
+    "必ず提供された公式情報のみを使用し、推測はしないでください。"
+    "出力は以下スキーマのJSONのみです。"
+    "{"
+    "\"business_summary\": 日本語200〜300文字の要約,"
+    "\"business_bullets\": 主要サービスを最大5件の配列 (各項目は50文字以内),"
+    "\"recent_news\": 最大3件の配列。各要素は {date: YYYY-MM-DD, headline: 30文字以内, url: 公式URL},"
+    "\"competitors_hint\": 同業他社候補を最大5件の配列"
+    "}"
+)
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+USER_PROMPT_TEMPLATE = (
+    "企業名: {company_name}\n"
+    "公式サイト: {official_url}\n"
+    "---公式情報---\n"
+    "{snippets}\n"
+    "---ニュース候補---\n"
+    "{news}\n"
+    "出力はJSONのみ。推測禁止。確証がない場合は配列を空にしてください。"
+)
+
+NEWS_KEYS = ("date", "headline", "url")
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+EMBEDDING_INPUT_LIMIT = 8000
+
+
+@dataclass(slots=True)
+class ReportRequest:
+    company_name: str
+    official_url: str
+    content_samples: List[str]
+    news_candidates: List[SearchResult]
+
 
 @dataclass(slots=True)
 class ReportGenerator:
     settings: Settings
     _client: OpenAI = field(init=False, repr=False)
+    _cache: Optional[ReportCache] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required to generate reports")
         self._client = OpenAI(api_key=self.settings.openai_api_key)
+        self._cache = None
+        if self.settings.llm_cache_path:
+            self._cache = ReportCache(Path(self.settings.llm_cache_path), self.settings.llm_cache_ttl)
 
     def generate(
         self,
@@ -31,53 +73,163 @@ class ReportGenerator:
         news_candidates: Iterable[SearchResult],
     ) -> ReportResult:
         prompt = self._build_prompt(company_name, official_url, content_samples, news_candidates)
+        cache_key = self._cache_key(prompt)
+        if self._cache:
+            cached = self._cache.get(cache_key)
+            if cached:
+                logger.info("Report cache hit for %s", company_name)
+                return cached
+        scope = urlparse(official_url).netloc.lower()
+        embedding = self._embed(prompt) if self._cache and self.settings.semantic_cache_threshold > 0 else None
+        if embedding:
+            similar = self._cache.find_similar(scope, embedding, self.settings.semantic_cache_threshold)
+            if similar:
+                logger.info("Semantic report cache hit for %s", company_name)
+                self._cache.put(cache_key, similar)
+                return similar
         try:
-            response = self._client.chat.completions.create(
-                model=self.settings.llm_model,
-                temperature=self.settings.llm_temperature,
-                top_p=self.settings.llm_top_p,
-                response_format={"type": "json_object"},
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "あなたは日本語で企業情報の要約を作成するアシスタントです。"
-                            "必ず提供された公式情報のみを使用し、推測はしないでください。"
-                            "出力は以下スキーマのJSONのみです。"
-                            "{"
-                            "\"business_summary\": 日本語200〜300文字の要約,"
-                            "\"business_bullets\": 主要サービスを最大5件の配列 (各項目は50文字以内),"
-                            "\"recent_news\": 最大3件の配列。各要素は {date: YYYY-MM-DD, headline: 30文字以内, url: 公式URL},"
-                            "\"competitors_hint\": 同業他社候補を最大5件の配列"
-                            "}"
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
+            response = self._client.chat.completions.create(**self._request_body(prompt))
         except OpenAIError as exc:
             logger.error("Failed to call OpenAI: %s", exc)
             raise
 
         content = response.choices[0].message.content if response.choices else ""
+        report = self._parse_report(content)
+        if self._cache:
+            self._cache.put(cache_key, report)
+            if embedding:
+                self._cache.put_embedding(scope, embedding, report)
+        return report
+
+    def generate_many(self, requests: Dict[str, ReportRequest]) -> Dict[str, ReportResult]:
+        reports: Dict[str, ReportResult] = {}
+        pending: Dict[str, tuple[str, str]] = {}
+        for request_id, request in requests.items():
+            prompt = self._build_prompt(
+                request.company_name,
+                request.official_url,
+                request.content_samples,
+                request.news_candidates,
+            )
+            cache_key = self._cache_key(prompt)
+            cached = self._cache.get(cache_key) if self._cache else None
+            if cached:
+                reports[request_id] = cached
+            else:
+                pending[request_id] = (prompt, cache_key)
+        if not pending:
+            return reports
+
+        lines = [
+            orjson.dumps(
+                {
+                    "custom_id": request_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._request_body(prompt),
+                }
+            )
+            for request_id, (prompt, _) in pending.items()
+        ]
+        try:
+            batch_input = self._client.files.create(
+                file=("reports.jsonl", b"\n".join(lines)),
+                purpose="batch",
+            )
+            batch = self._client.batches.create(
+                input_file_id=batch_input.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info("Submitted OpenAI batch %s with %s requests", batch.id, len(lines))
+            while batch.status not in BATCH_TERMINAL_STATUSES:
+                time.sleep(self.settings.llm_batch_poll_interval)
+                batch = self._client.batches.retrieve(batch.id)
+            if batch.status != "completed" or not batch.output_file_id:
+                logger.error("OpenAI batch %s ended with status %s", batch.id, batch.status)
+                return reports
+            output = self._client.files.content(batch.output_file_id).text
+        except OpenAIError as exc:
+            logger.error("Failed to run OpenAI batch: %s", exc)
+            return reports
+
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                logger.warning("Skipping unparsable batch output line: %s", exc)
+                continue
+            request_id = entry.get("custom_id")
+            response = entry.get("response") or {}
+            if request_id not in pending or response.get("status_code") != 200:
+                logger.warning("Batch request %s failed: %s", request_id, entry.get("error"))
+                continue
+            choices = response.get("body", {}).get("choices") or []
+            content = choices[0].get("message", {}).get("content") if choices else ""
+            try:
+                report = self._parse_report(content)
+            except (RuntimeError, ValueError) as exc:
+                logger.warning("Batch request %s returned an unusable report: %s", request_id, exc)
+                continue
+            reports[request_id] = report
+            if self._cache:
+                self._cache.put(pending[request_id][1], report)
+        return reports
+
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        try:
+            response = self._client.embeddings.create(
+                model=self.settings.embedding_model,
+                input=prompt[:EMBEDDING_INPUT_LIMIT],
+            )
+        except OpenAIError as exc:
+            logger.warning("Failed to embed prompt for semantic cache: %s", exc)
+            return None
+        return list(response.data[0].embedding) if response.data else None
+
+    def _request_body(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.settings.llm_model,
+            "temperature": self.settings.llm_temperature,
+            "top_p": self.settings.llm_top_p,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt},
+            ],
+        }
+
+    def _cache_key(self, prompt: str) -> str:
+        return make_cache_key(
+            model=self.settings.llm_model,
+            temperature=self.settings.llm_temperature,
+            top_p=self.settings.llm_top_p,
+            system=SYSTEM_PROMPT,
+            prompt=prompt,
+        )
+
+    @staticmethod
+    def _parse_report(content: Optional[str]) -> ReportResult:
         if not content:
             raise RuntimeError("LLM returned empty response")
-        data = json.loads(content)
-        summary = data.get("business_summary", "").strip()
-        bullets = [item.strip() for item in data.get("business_bullets", []) if item]
+        data = orjson.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError("LLM response is not a JSON object")
+        summary = data.get("business_summary")
         news_items = []
-        for item in data.get("recent_news", [])[:3]:
-            date = (item.get("date") or "").strip()
-            headline = (item.get("headline") or "").strip()
-            url = (item.get("url") or "").strip()
+        for item in _list_field(data, "recent_news")[:3]:
+            if not isinstance(item, dict):
+                continue
+            date, headline, url = (_clean_text(item.get(key)) for key in NEWS_KEYS)
             if date and headline and url:
                 news_items.append({"date": date, "headline": headline, "url": url})
-        competitors = [item.strip() for item in data.get("competitors_hint", []) if item]
         return ReportResult(
-            business_summary=summary,
-            business_bullets=bullets[:5],
+            business_summary=_clean_text(summary),
+            business_bullets=_string_items(data, "business_bullets")[:5],
             recent_news=news_items,
-            competitors_hint=competitors[:5],
+            competitors_hint=_string_items(data, "competitors_hint")[:5],
         )
 
     def _build_prompt(
@@ -98,13 +250,22 @@ class ReportGenerator:
                 continue
             headline = (result.title or "").strip()
             news_lines.append(f"{headline}\t{result.url}")
-        prompt = (
-            f"企業名: {company_name}\n"
-            f"公式サイト: {official_url}\n"
-            "---公式情報---\n"
-            + "\n".join(snippets)
-            + "\n---ニュース候補---\n"
-            + "\n".join(news_lines)
-            + "\n出力はJSONのみ。推測禁止。確証がない場合は配列を空にしてください。"
+        return USER_PROMPT_TEMPLATE.format(
+            company_name=company_name,
+            official_url=official_url,
+            snippets="\n".join(snippets),
+            news="\n".join(news_lines),
         )
-        return prompt
+
+
+def _clean_text(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _list_field(data: Dict[str, Any], key: str) -> List[Any]:
+    value = data.get(key)
+    return value if isinstance(value, list) else []
+
+
+def _string_items(data: Dict[str, Any], key: str) -> List[str]:
+    return [cleaned for cleaned in map(_clean_text, _list_field(data, key)) if cleaned]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import Settings
 from .models import SearchResult
@@ -19,6 +21,13 @@ class SearchClientError(RuntimeError):
 @dataclass(slots=True)
 class SearchClient:
     settings: Settings
+    session: requests.Session = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": self.settings.user_agent})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, self.settings.max_workers))
+        self.session.mount("https://", adapter)
 
     def search_web(self, query: str, count: Optional[int] = None) -> List[SearchResult]:
         provider = (self.settings.search_provider or "bing").lower()
@@ -52,27 +61,22 @@ class SearchClient:
             "responseFilter": "Webpages",
             "safeSearch": "Moderate",
         }
-        headers = {
-            "Ocp-Apim-Subscription-Key": self.settings.bing_api_key,
-            "User-Agent": self.settings.user_agent,
-        }
-        response = requests.get(url, params=params, headers=headers, timeout=self.settings.request_timeout)
+        headers = {"Ocp-Apim-Subscription-Key": self.settings.bing_api_key}
+        response = self.session.get(url, params=params, headers=headers, timeout=self.settings.request_timeout)
         if response.status_code != 200:
             logger.error("Bing search failed: %s", response.text)
             raise SearchClientError(f"Bing search failed with status {response.status_code}")
-        data = response.json()
+        data = orjson.loads(response.content)
         web_pages = data.get("webPages", {}).get("value", [])
-        results: List[SearchResult] = []
-        for idx, item in enumerate(web_pages):
-            results.append(
-                SearchResult(
-                    title=item.get("name", ""),
-                    url=item.get("url", ""),
-                    snippet=item.get("snippet"),
-                    rank=idx + 1,
-                )
+        return [
+            SearchResult(
+                title=item.get("name", ""),
+                url=item.get("url", ""),
+                snippet=item.get("snippet"),
+                rank=rank,
             )
-        return results
+            for rank, item in enumerate(web_pages, start=1)
+        ]
 
     def _tavily_search(self, query: str, count: int) -> List[SearchResult]:
         api_key = self.settings.tavily_api_key
@@ -87,28 +91,22 @@ class SearchClient:
             "include_images": False,
             "include_raw_content": False,
         }
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            "User-Agent": self.settings.user_agent,
-        }
-        response = requests.post(url, json=payload, headers=headers, timeout=self.settings.request_timeout)
+        headers = {"Authorization": f"Bearer {api_key}"}
+        response = self.session.post(url, json=payload, headers=headers, timeout=self.settings.request_timeout)
         if response.status_code != 200:
             logger.error("Tavily search failed: %s", response.text)
             raise SearchClientError(f"Tavily search failed with status {response.status_code}")
-        data = response.json()
+        data = orjson.loads(response.content)
         results_data = data.get("results", [])
-        results: List[SearchResult] = []
-        for idx, item in enumerate(results_data):
-            results.append(
-                SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("url", ""),
-                    snippet=item.get("content"),
-                    rank=idx + 1,
-                )
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                url=item.get("url", ""),
+                snippet=item.get("content"),
+                rank=rank,
             )
-        return results
+            for rank, item in enumerate(results_data, start=1)
+        ]
 
     def _google_search(self, query: str, count: int) -> List[SearchResult]:
         if not (self.settings.google_search_api_key and self.settings.google_search_cx):
@@ -121,21 +119,18 @@ class SearchClient:
             "num": min(count, 10),
             "lr": "lang_ja",
         }
-        headers = {"User-Agent": self.settings.user_agent}
-        response = requests.get(url, params=params, headers=headers, timeout=self.settings.request_timeout)
+        response = self.session.get(url, params=params, timeout=self.settings.request_timeout)
         if response.status_code != 200:
             logger.error("Google Custom Search failed: %s", response.text)
             raise SearchClientError(f"Google search failed with status {response.status_code}")
-        data = response.json()
+        data = orjson.loads(response.content)
         items = data.get("items", [])
-        results: List[SearchResult] = []
-        for idx, item in enumerate(items):
-            results.append(
-                SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("link", ""),
-                    snippet=item.get("snippet"),
-                    rank=idx + 1,
-                )
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                url=item.get("link", ""),
+                snippet=item.get("snippet"),
+                rank=rank,
             )
-        return results
+            for rank, item in enumerate(items, start=1)
+        ]
@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Set
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Protocol, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import phonenumbers
 import requests
+from requests.adapters import HTTPAdapter
 import tldextract
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit
 
 from .config import Settings
 from .models import ExtractionResult, PageContent
@@ -41,15 +45,56 @@ ROLE_EMAIL_KEYWORDS = [
     "ir",
 ]
 
-SNS_PATTERNS: Dict[str, List[str]] = {
-    "sns_linkedin": ["linkedin.com/company", "linkedin.com/in"],
+SNS_HOSTS: Dict[str, List[str]] = {
+    "sns_linkedin": ["linkedin.com"],
     "sns_x": ["twitter.com", "x.com"],
     "sns_instagram": ["instagram.com"],
     "sns_facebook": ["facebook.com", "fb.me"],
 }
+# LinkedIn links only count when they point at a company or member profile.
+LINKEDIN_PROFILE_PATHS = ("/company", "/in/")
+
+
+def keyword_regex(keywords: Iterable[str]) -> re.Pattern[str]:
+    # Longest first so overlapping keywords resolve to the most specific one.
+    return re.compile("|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+
+
+CONTACT_RE = keyword_regex(CONTACT_KEYWORDS)
+ROLE_EMAIL_RE = keyword_regex(ROLE_EMAIL_KEYWORDS)
+SNS_KEY_BY_HOST: Dict[str, str] = {host: key for key, hosts in SNS_HOSTS.items() for host in hosts}
+
+
+def _select_html_parser() -> str:
+    # Prefer the C-backed lxml tree builder when installed (pip install .[fast]).
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+HTML_PARSER = _select_html_parser()
+
+Anchor = Tuple[str, str, str]
+
+# Labels looked for just before a phone-number match to tell TEL from FAX; the nearest one wins.
+PHONE_LABEL_RE = re.compile(r"FAX|ＦＡＸ|TEL|ＴＥＬ|電話|Phone", re.IGNORECASE)
+FAX_LABELS = {"FAX", "ＦＡＸ"}
+PHONE_LABEL_WINDOW = 16
 
 EMAIL_PATTERN = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
-PHONE_PATTERN = re.compile(r"(?:(?:\+?81[-\s]?)?0[0-9]{1,4}[-‐–―\s]?[0-9]{1,4}[-‐–―\s]?[0-9]{3,4})")
+HTML_ACCEPT = "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1"
+TEXTUAL_CONTENT_TYPES = ("text/", "html", "xml")
+# The lookbehind keeps the scan from restarting inside long digit runs (order numbers, postal codes).
+PHONE_PATTERN = re.compile(r"(?<![0-9])(?:(?:\+?81[-\s]?)?0[0-9]{1,4}[-‐–―\s]?[0-9]{1,4}[-‐–―\s]?[0-9]{3,4})")
+_NON_DIGIT_RE = re.compile(r"[^0-9+]")
+
+
+class Fetcher(Protocol):
+    # Structural type so any object with fetch() works, including under the mypyc build,
+    # which would otherwise reject anything that is not a PageFetcher instance.
+    def fetch(self, url: str) -> Optional[PageContent]: ...
 
 
 @dataclass(slots=True)
@@ -59,63 +104,110 @@ class PageFetcher:
 
     def __post_init__(self) -> None:
         self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.settings.user_agent})
+        self.session.headers.update({"User-Agent": self.settings.user_agent, "Accept": HTML_ACCEPT})
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def fetch(self, url: str) -> Optional[PageContent]:
+        max_bytes = self.settings.max_html_bytes
         try:
-            response = self.session.get(url, timeout=self.settings.request_timeout)
-            response.raise_for_status()
+            with self.session.get(url, timeout=self.settings.request_timeout, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").lower()
+                if content_type and not any(kind in content_type for kind in TEXTUAL_CONTENT_TYPES):
+                    logger.info("Skipping non-HTML response from %s (%s)", url, content_type)
+                    return None
+                # Read at most max_bytes (+1 to detect overflow) instead of buffering the whole body.
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    body += chunk
+                    if len(body) > max_bytes:
+                        logger.warning("Skipping %s: response exceeds %s bytes", url, max_bytes)
+                        return None
+                final_url = response.url
+                declared = [response.encoding] if response.encoding and "charset" in content_type else []
         except requests.RequestException as exc:
             logger.warning("Failed to fetch %s: %s", url, exc)
             return None
-        html = response.text
-        soup = BeautifulSoup(html, "html.parser")
+        # Without a charset header, let UnicodeDammit sniff <meta charset> (Shift_JIS/EUC-JP sites).
+        html = UnicodeDammit(bytes(body), declared, is_html=True).unicode_markup or ""
+        soup = BeautifulSoup(html, HTML_PARSER)
         text = soup.get_text(" ", strip=True)
-        return PageContent(url=response.url, html=html, text=text)
+        return PageContent(url=final_url, html=html, text=text, soup=soup)
+
+
+_default_fetchers: Dict[tuple, PageFetcher] = {}
+_default_fetchers_lock = threading.Lock()
+
+
+def get_default_fetcher(settings: Settings) -> PageFetcher:
+    # One pooled session per process so the selector and crawler share warm connections.
+    key = (settings.user_agent, settings.request_timeout, settings.max_html_bytes)
+    with _default_fetchers_lock:
+        fetcher = _default_fetchers.get(key)
+        if fetcher is None:
+            fetcher = _default_fetchers[key] = PageFetcher(settings)
+        return fetcher
 
 
 class SiteCrawler:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, fetcher: Optional[Fetcher] = None):
         self.settings = settings
-        self.fetcher = PageFetcher(settings)
+        self.fetcher: Fetcher = fetcher or get_default_fetcher(settings)
 
-    def crawl(self, base_url: str) -> List[PageContent]:
-        visited: Set[str] = set()
+    def crawl(self, base_url: str, stop_when: Optional[Callable[[PageContent], bool]] = None) -> List[PageContent]:
+        # URLs are deduplicated when scheduled, so the queues never hold the same page twice.
+        # Only 64-bit fingerprints are kept; a collision at crawl scale (~2^-64) is negligible.
+        scheduled: Set[int] = {_url_fingerprint(self._normalize_url(base_url))}
         results: List[PageContent] = []
-        queue = deque([(base_url, 0)])
+        # Contact-looking links go to the high-priority queue; both stay FIFO so depth order holds.
+        high: Deque[Tuple[str, int]] = deque()
+        low: Deque[Tuple[str, int]] = deque([(base_url, 0)])
         base_host = urlparse(base_url).netloc
+        max_pages = self.settings.crawler_max_pages
+
+        with ThreadPoolExecutor(max_workers=max(1, self.settings.crawler_concurrency)) as executor:
+            while (high or low) and len(results) < max_pages:
+                # Fetch the next wave concurrently, never more than the pages still needed.
+                wave = [
+                    high.popleft() if high else low.popleft()
+                    for _ in range(min(len(high) + len(low), max_pages - len(results)))
+                ]
+                pages = executor.map(self.fetcher.fetch, [url for url, _ in wave])
+                for (_, depth), page in zip(wave, pages):
+                    if not page:
+                        continue
+                    results.append(page)
+                    if stop_when and stop_when(page):
+                        return results
+                    scheduled.add(_url_fingerprint(self._normalize_url(page.url)))  # redirect target
+                    if depth < self.settings.crawler_max_depth:
+                        self._enqueue_links(page, depth, base_host, high, low, scheduled)
+        return results
 
-        while queue and len(results) < self.settings.crawler_max_pages:
-            url, depth = queue.popleft()
-            normalized_url = self._normalize_url(url)
-            if normalized_url in visited:
+    @staticmethod
+    def _enqueue_links(
+        page: PageContent,
+        depth: int,
+        base_host: str,
+        high: Deque[Tuple[str, int]],
+        low: Deque[Tuple[str, int]],
+        scheduled: Set[int],
+    ) -> None:
+        for _, href, abs_url in _page_anchors(page):
+            parsed = urlparse(abs_url)
+            if parsed.scheme not in {"http", "https"}:
                 continue
-            visited.add(normalized_url)
-
-            page = self.fetcher.fetch(url)
-            if not page:
+            if parsed.netloc != base_host:
                 continue
-            results.append(page)
-
-            if depth >= self.settings.crawler_max_depth:
+            abs_url = parsed._replace(fragment="").geturl()
+            fingerprint = _url_fingerprint(abs_url)
+            if fingerprint in scheduled:
                 continue
-
-            soup = BeautifulSoup(page.html, "html.parser")
-            for link in soup.find_all("a", href=True):
-                href = link.get("href")
-                if not href:
-                    continue
-                abs_url = urljoin(page.url, href)
-                parsed = urlparse(abs_url)
-                if parsed.scheme not in {"http", "https"}:
-                    continue
-                if parsed.netloc != base_host:
-                    continue
-                if any(keyword in href.lower() for keyword in CONTACT_KEYWORDS):
-                    queue.appendleft((abs_url, depth + 1))
-                else:
-                    queue.append((abs_url, depth + 1))
-        return results
+            scheduled.add(fingerprint)
+            queue = high if CONTACT_RE.search(href) else low
+            queue.append((abs_url, depth + 1))
 
     @staticmethod
     def _normalize_url(url: str) -> str:
@@ -124,28 +216,92 @@ class SiteCrawler:
         return normalized
 
 
+def _url_fingerprint(url: str) -> int:
+    # str hashes are 64-bit SipHash and cached on the string; stable for the life of one crawl.
+    return hash(url)
+
+
+def _page_soup(page: PageContent) -> BeautifulSoup:
+    if page.soup is None:
+        page.soup = BeautifulSoup(page.html, HTML_PARSER)
+    return page.soup
+
+
+def _page_anchors(page: PageContent) -> List[Anchor]:
+    # One DOM walk per page, shared by link discovery and every extractor.
+    if page.anchors is None:
+        page.anchors = _iter_anchors(_page_soup(page), page.url)
+    return page.anchors
+
+
+def _iter_anchors(soup: BeautifulSoup, base_url: str) -> List[Anchor]:
+    anchors: List[Anchor] = []
+    for anchor in soup.find_all("a", href=True):
+        # bs4 types attribute values as str | list; href is always a single string.
+        href = str(anchor.get("href") or "")
+        if href:
+            label = (anchor.get_text() or "").strip().lower()
+            anchors.append((label, href.lower(), urljoin(base_url, href)))
+    return anchors
+
+
+# Use the public suffix list bundled with tldextract; never fetch it over the network at runtime.
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), include_psl_private_domains=False)
+
+
+@lru_cache(maxsize=8192)
 def pick_best_domain(url: str) -> str:
-    extracted = tldextract.extract(url)
+    extracted = _TLD_EXTRACT(url)
     parts = [p for p in [extracted.domain, extracted.suffix] if p]
     return ".".join(parts)
 
 
+@dataclass(slots=True)
+class PageSignals:
+    emails: List[str]
+    sns: Dict[str, str]
+    contact_link: Optional[str]
+    phone: Optional[str]
+    fax: Optional[str]
+
+
+def extract_page_signals(page: PageContent) -> PageSignals:
+    # One pass over the cached anchors and one over the text yields every per-page signal.
+    emails: Set[str] = set()
+    sns: Dict[str, str] = {}
+    contact_link: Optional[str] = None
+    for label, href, abs_url in _page_anchors(page):
+        if href.startswith("mailto:"):
+            email = href[len("mailto:") :]
+            if _is_email(email):
+                emails.add(email)
+            continue
+        if contact_link is None and (CONTACT_RE.search(label) or CONTACT_RE.search(href)):
+            contact_link = abs_url
+        sns_key = _sns_key(abs_url)
+        if sns_key:
+            sns.setdefault(sns_key, abs_url)
+    text = page.text or _page_soup(page).get_text(" ", strip=True)
+    # findall hits already satisfy EMAIL_PATTERN; only mailto hrefs need validating.
+    emails.update(match.lower() for match in EMAIL_PATTERN.findall(text))
+    phone, fax = _extract_phone_fax(text)
+    return PageSignals(emails=sorted(emails), sns=sns, contact_link=contact_link, phone=phone, fax=fax)
+
+
 def extract_contact_info(pages: Iterable[PageContent], base_url: str) -> ExtractionResult:
     extraction = ExtractionResult()
     domain = urlparse(base_url).netloc
     evidence: Set[str] = set()
 
     for page in pages:
-        soup = BeautifulSoup(page.html, "html.parser")
+        signals = extract_page_signals(page)
         # Contact form URL detection
-        if not extraction.contact_form_url:
-            link = _find_contact_link(soup, page.url)
-            if link:
-                extraction.contact_form_url = link
-                evidence.add(link)
+        if signals.contact_link and not extraction.contact_form_url:
+            extraction.contact_form_url = signals.contact_link
+            evidence.add(signals.contact_link)
 
         # Emails
-        emails = _extract_emails_from_page(soup)
+        emails = signals.emails
         role_emails = [email for email in emails if _is_role_email(email)]
         if role_emails and not extraction.email_main:
             extraction.email_main = role_emails[0]
@@ -158,21 +314,24 @@ def extract_contact_info(pages: Iterable[PageContent], base_url: str) -> Extract
             evidence.add(page.url)
 
         # Phone / Fax
-        phone, fax = _extract_phone_fax(soup)
-        if phone and not extraction.phone_main:
-            extraction.phone_main = phone
+        if signals.phone and not extraction.phone_main:
+            extraction.phone_main = signals.phone
             evidence.add(page.url)
-        if fax and not extraction.fax_main:
-            extraction.fax_main = fax
+        if signals.fax and not extraction.fax_main:
+            extraction.fax_main = signals.fax
             evidence.add(page.url)
 
         # SNS
-        sns_links = _extract_sns_links(soup, page.url)
-        for key, value in sns_links.items():
+        for key, value in signals.sns.items():
             if key not in extraction.sns:
                 extraction.sns[key] = value
                 evidence.add(value)
 
+        # Only page.text is used after extraction; drop the markup and tree so they can be freed.
+        page.html = ""
+        page.soup = None
+        page.anchors = None
+
     if not extraction.email_role_based:
         guessed = _guess_role_emails(domain)
         extraction.email_guessed.extend(guessed)
@@ -186,32 +345,6 @@ def extract_contact_info(pages: Iterable[PageContent], base_url: str) -> Extract
     return extraction
 
 
-def _find_contact_link(soup: BeautifulSoup, current_url: str) -> Optional[str]:
-    for anchor in soup.find_all("a", href=True):
-        label = (anchor.get_text() or "").strip().lower()
-        href = anchor.get("href")
-        joined = urljoin(current_url, href)
-        haystack = " ".join([label, href.lower()])
-        if any(keyword in haystack for keyword in CONTACT_KEYWORDS):
-            return joined
-    return None
-
-
-def _extract_emails_from_page(soup: BeautifulSoup) -> List[str]:
-    emails: Set[str] = set()
-    for mailto in soup.select("a[href^='mailto:']"):
-        href = mailto.get("href")
-        if href:
-            email = href.split(":", 1)[1]
-            if _is_email(email):
-                emails.add(email.lower())
-    text = soup.get_text(" ", strip=True)
-    for match in EMAIL_PATTERN.findall(text):
-        if _is_email(match):
-            emails.add(match.lower())
-    return sorted(emails)
-
-
 def _is_email(email: str) -> bool:
     return bool(EMAIL_PATTERN.fullmatch(email.strip()))
 
@@ -219,35 +352,38 @@ def _is_email(email: str) -> bool:
 def _is_role_email(email: str) -> bool:
     local_part = email.split("@", 1)[0]
     normalized = local_part.replace("-", "").replace("_", "").lower()
-    return any(normalized.startswith(keyword) or keyword in normalized for keyword in ROLE_EMAIL_KEYWORDS)
+    return bool(ROLE_EMAIL_RE.search(normalized))
 
 
-def _extract_phone_fax(soup: BeautifulSoup) -> tuple[Optional[str], Optional[str]]:
+def _extract_phone_fax(text: str) -> tuple[Optional[str], Optional[str]]:
     phone = None
     fax = None
-    text_snippets = [string.strip() for string in soup.stripped_strings if string]
-    for snippet in text_snippets:
-        if "FAX" in snippet.upper() or "ＦＡＸ" in snippet:
-            candidate = _normalize_phone(snippet)
-            if candidate:
-                fax = candidate
-        elif any(keyword in snippet for keyword in ["TEL", "電話", "Phone", "電話番号"]):
-            candidate = _normalize_phone(snippet)
-            if candidate:
-                phone = candidate
-    if not phone or not fax:
-        full_text = soup.get_text(" ", strip=True)
-        for match in PHONE_PATTERN.findall(full_text):
-            normalized = _normalize_phone(match)
-            if normalized and not phone:
-                phone = normalized
-    return phone, fax
-
-
+    unlabeled = None
+    for match in PHONE_PATTERN.finditer(text):
+        context = text[max(0, match.start() - PHONE_LABEL_WINDOW) : match.start()]
+        labels = PHONE_LABEL_RE.findall(context)
+        label = labels[-1].upper() if labels else None
+        if label in FAX_LABELS:
+            if not fax:
+                fax = _normalize_phone(match.group())
+        elif label:
+            if not phone:
+                phone = _normalize_phone(match.group())
+        elif not unlabeled:
+            unlabeled = _normalize_phone(match.group())
+        if phone and fax:
+            break
+    return phone or unlabeled, fax
+
+
+@lru_cache(maxsize=2048)
 def _normalize_phone(raw: str) -> Optional[str]:
-    digits = re.sub(r"[^0-9+]", "", raw)
+    digits = _NON_DIGIT_RE.sub("", raw)
     if not digits:
         return None
+    # Domestic JP numbers ("0" + 9-10 digits) are the common case; skip phonenumbers for them.
+    if digits[0] == "0" and digits[1:2] != "0" and 10 <= len(digits) <= 11:
+        return "+81" + digits[1:]
     try:
         if digits.startswith("+"):
             parsed = phonenumbers.parse(digits, None)
@@ -260,16 +396,14 @@ def _normalize_phone(raw: str) -> Optional[str]:
         return None
 
 
-def _extract_sns_links(soup: BeautifulSoup, current_url: str) -> Dict[str, str]:
-    results: Dict[str, str] = {}
-    for anchor in soup.find_all("a", href=True):
-        href = anchor.get("href")
-        abs_url = urljoin(current_url, href)
-        lower = abs_url.lower()
-        for key, patterns in SNS_PATTERNS.items():
-            if any(pattern in lower for pattern in patterns):
-                results[key] = abs_url
-    return results
+def _sns_key(abs_url: str) -> Optional[str]:
+    parsed = urlparse(abs_url)
+    host = parsed.hostname or ""
+    # Exact host first, then with one subdomain label dropped (www., m., jp., ...).
+    key = SNS_KEY_BY_HOST.get(host) or SNS_KEY_BY_HOST.get(host.partition(".")[2])
+    if key == "sns_linkedin" and not parsed.path.lower().startswith(LINKEDIN_PROFILE_PATHS):
+        return None
+    return key
 
 
 def _guess_role_emails(domain: str) -> List[str]:
@@ -3,11 +3,12 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
 from urllib.parse import urlparse
 
 from .models import PageContent, SearchResult
-from .site_scraper import CONTACT_KEYWORDS, PageFetcher, pick_best_domain
+from .site_scraper import CONTACT_KEYWORDS, Fetcher, PageFetcher, get_default_fetcher, keyword_regex, pick_best_domain
 from .config import Settings
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,13 @@ OFFICIAL_KEYWORDS = [
     "Corporate",
     "沿革",
 ]
+# Every scoring keyword in one pattern so a candidate page's text is scanned once.
+SCORE_KEYWORD_KINDS: Dict[str, str] = {
+    **{keyword: "contact" for keyword in CONTACT_KEYWORDS},
+    **{keyword: "official" for keyword in OFFICIAL_KEYWORDS},
+}
+SCORE_RE = keyword_regex(SCORE_KEYWORD_KINDS)
+_NAME_STRIP_RE = re.compile(r"[^a-z0-9]")
 
 
 @dataclass(slots=True)
@@ -30,9 +38,9 @@ class SiteCandidate:
 
 
 class OfficialSiteSelector:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, fetcher: Optional[Fetcher] = None):
         self.settings = settings
-        self.fetcher = PageFetcher(settings)
+        self.fetcher: Fetcher = fetcher or get_default_fetcher(settings)
 
     def select(self, company_name: str, candidates: Iterable[SearchResult]) -> Optional[SiteCandidate]:
         normalized_name = _normalize_company_name(company_name)
@@ -58,23 +66,23 @@ class OfficialSiteSelector:
         title_match = re.search(re.escape(normalized_name), page.text, re.IGNORECASE)
         if title_match:
             score += 2.0
-        for keyword in OFFICIAL_KEYWORDS:
-            if keyword in page.text:
-                score += 1.0
-        if any(keyword in page.text for keyword in CONTACT_KEYWORDS):
+        kinds = [SCORE_KEYWORD_KINDS[hit] for hit in set(SCORE_RE.findall(page.text))]
+        score += 1.0 * kinds.count("official")
+        if "contact" in kinds:
             score += 0.5
         if hostname.endswith(".go.jp"):
             score -= 2.0  # governmental domains unlikely for private firms
         return score
 
 
+@lru_cache(maxsize=4096)
 def _normalize_company_name(name: str) -> str:
     normalized = name.lower()
     normalized = normalized.replace("株式会社", "")
     normalized = normalized.replace("有限会社", "")
     normalized = normalized.replace("inc.", "")
     normalized = normalized.replace("co., ltd.", "")
-    normalized = re.sub(r"[^a-z0-9]", "", normalized)
+    normalized = _NAME_STRIP_RE.sub("", normalized)
     return normalized
 
 
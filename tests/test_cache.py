@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from sales_lead_builder.cache import ReportCache, make_cache_key
+from sales_lead_builder.models import ReportResult
+
+
+def test_report_cache_round_trip(tmp_path):
+    cache = ReportCache(tmp_path / "cache.sqlite3", ttl_seconds=0)
+    key = make_cache_key(model="gpt-4o-mini", prompt="企業名: Example")
+    report = ReportResult(
+        business_summary="概要",
+        business_bullets=["サービスA"],
+        recent_news=[{"date": "2024-01-01", "headline": "発表", "url": "https://example.co.jp/news"}],
+        competitors_hint=["Other"],
+    )
+    assert cache.get(key) is None
+    cache.put(key, report)
+    assert cache.get(key) == report
+    assert make_cache_key(model="gpt-4o", prompt="企業名: Example") != key
+
+
+def test_report_cache_semantic_lookup_is_scoped(tmp_path):
+    cache = ReportCache(tmp_path / "cache.sqlite3", ttl_seconds=0)
+    report = ReportResult(business_summary="概要", business_bullets=[], recent_news=[], competitors_hint=[])
+    cache.put_embedding("example.co.jp", [1.0, 0.0, 0.0], report)
+
+    assert cache.find_similar("example.co.jp", [0.99, 0.05, 0.0], threshold=0.92) == report
+    assert cache.find_similar("example.co.jp", [0.0, 1.0, 0.0], threshold=0.92) is None
+    assert cache.find_similar("other.co.jp", [1.0, 0.0, 0.0], threshold=0.92) is None
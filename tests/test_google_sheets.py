@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from sales_lead_builder.config import Settings
+from sales_lead_builder.google_sheets import SheetsClient
+from sales_lead_builder.models import CompanyRow
+
+
+def _client() -> SheetsClient:
+    client = object.__new__(SheetsClient)
+    client.settings = Settings(spreadsheet_id="dummy")
+    return client
+
+
+def test_row_value_ranges_writes_only_runs_of_updated_columns():
+    row = CompanyRow.from_row(4, ["Acme", "acme.jp", "https://acme.jp"] + [""] * 16 + ["TRUE", "pending"])
+    updates = {
+        "website_url": "https://acme.co.jp",
+        "contact_form_url": None,
+        "email_main": "info@acme.jp",
+        "status": "ok",
+    }
+    data = _client()._row_value_ranges(row, updates)
+
+    assert data == [
+        {"range": "prospects!C5:E5", "values": [["https://acme.co.jp", "", "info@acme.jp"]]},
+        {"range": "prospects!U5:U5", "values": [["ok"]]},
+    ]
+
+
+def test_error_update_leaves_research_columns_untouched():
+    row = CompanyRow.from_row(4, ["Acme", "0312345678", "=HYPERLINK(\"x\")"] + [""] * 16 + ["", "ok"])
+    updates = row.to_update_payload({"status": "error", "error_detail": "boom"})
+    data = _client()._row_value_ranges(row, updates)
+
+    assert [item["range"] for item in data] == ["prospects!S5:S5", "prospects!U5:V5"]
+    assert data[1]["values"] == [["error", "boom"]]
+
+
+def test_row_value_ranges_skips_untouched_segments():
+    row = CompanyRow.from_row(1, ["Acme"])
+    data = _client()._row_value_ranges(row, {"status": "error", "error_detail": "boom"})
+    assert data == [{"range": "prospects!U2:V2", "values": [["error", "boom"]]}]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sales_lead_builder.models import CompanyRow
+from dataclasses import fields
+
+from sales_lead_builder.models import SHEET_COLUMNS, CompanyRow, LogEntry
 
 
 def test_company_row_from_row_handles_missing_columns():
@@ -10,3 +12,37 @@ def test_company_row_from_row_handles_missing_columns():
     assert row.website_url == "https://acme.jp"
     assert row.status is None
     assert not row.lock_manual_override
+
+
+def test_company_row_fields_follow_sheet_column_order():
+    field_names = tuple(f.name for f in fields(CompanyRow))
+    assert field_names[1:] == tuple(SHEET_COLUMNS)
+
+
+def test_company_row_from_row_parses_full_row():
+    values = ["  Acme  "] + [""] * 18 + [" TRUE ", "ok", " "]
+    row = CompanyRow.from_row(4, values)
+    assert row.row_index == 4
+    assert row.company_name == "Acme"
+    assert row.lock_manual_override is True
+    assert row.status == "ok"
+    assert row.error_detail is None
+    assert row.resolved_domain is None
+
+
+def test_company_row_from_rows_assigns_consecutive_indexes():
+    rows = CompanyRow.from_rows(1, [["Acme"], [], ["Beta", "beta.jp"]])
+    assert [row.row_index for row in rows] == [1, 2, 3]
+    assert [row.company_name for row in rows] == ["Acme", "", "Beta"]
+
+
+def test_to_update_payload_filters_unknown_fields_and_keeps_timestamp():
+    row = CompanyRow.from_row(1, ["Acme"])
+    payload = row.to_update_payload({"status": "ok", "email_main": None, "unknown": "x", "last_checked_at": "t"})
+    assert payload == {"status": "ok", "email_main": "", "last_checked_at": "t"}
+    assert row.to_update_payload({})["last_checked_at"]
+
+
+def test_log_entry_records_creation_time():
+    entry = LogEntry(stage="search", message="3 results")
+    assert entry.to_row() == [entry.timestamp, "search", "info", "3 results", ""]
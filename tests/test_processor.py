@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from sales_lead_builder import processor as processor_module
+from sales_lead_builder.config import Settings
+from sales_lead_builder.models import CompanyRow, LogEntry, SearchResult
+from sales_lead_builder.processor import LeadProcessor, ProcessOutcome
+
+
+class DummySheets:
+    def __init__(self, rows):
+        self._rows = rows
+        self.update_calls = []
+        self.log_calls = []
+
+    def fetch_rows(self, start_row: int = 2):
+        return self._rows
+
+    def update_rows(self, items):
+        self.update_calls.append(items)
+
+    def append_log(self, entries):
+        self.log_calls.append(entries)
+
+
+class DummyComponent:
+    def __init__(self, settings):
+        self.settings = settings
+
+
+def _processor(monkeypatch, rows) -> LeadProcessor:
+    for name in ("SheetsClient", "SearchClient", "OfficialSiteSelector", "SiteCrawler", "ReportGenerator"):
+        monkeypatch.setattr(processor_module, name, DummyComponent)
+    processor = LeadProcessor(Settings(spreadsheet_id="dummy"))
+    processor.sheets = DummySheets(rows)
+    return processor
+
+
+def test_process_sheet_batches_sheet_writes(monkeypatch):
+    rows = [CompanyRow.from_row(i, [f"Company {i}"]) for i in range(1, 4)]
+    processor = _processor(monkeypatch, rows)
+
+    def fake_run_row(self, row):
+        return ProcessOutcome(
+            row=row,
+            updates={"status": "ok"},
+            logs=[LogEntry(stage="complete", message="ok")],
+        )
+
+    monkeypatch.setattr(LeadProcessor, "_run_row", fake_run_row)
+    outcomes = processor.process_sheet()
+
+    assert len(outcomes) == 3
+    assert len(processor.sheets.update_calls) == 1
+    assert [row.row_index for row, _ in processor.sheets.update_calls[0]] == [1, 2, 3]
+    assert len(processor.sheets.log_calls) == 1
+    assert len(processor.sheets.log_calls[0]) == 3
+
+
+def test_process_sheet_respects_limit_and_filters(monkeypatch):
+    rows = [
+        CompanyRow.from_row(1, ["Locked", *[""] * 18, "TRUE"]),
+        CompanyRow.from_row(2, ["Done", *[""] * 19, "ok"]),
+        CompanyRow.from_row(3, ["Pending A"]),
+        CompanyRow.from_row(4, ["Pending B"]),
+    ]
+    processor = _processor(monkeypatch, rows)
+
+    def fake_run_row(self, row):
+        return ProcessOutcome(row=row, updates={"status": "ok"}, logs=[])
+
+    monkeypatch.setattr(LeadProcessor, "_run_row", fake_run_row)
+    outcomes = processor.process_sheet(limit=1)
+
+    assert [outcome.row.company_name for outcome in outcomes] == ["Pending A"]
+
+
+class DummySearch:
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+
+    def search_company_news(self, company_name):
+        self.calls += 1
+        return self.results
+
+
+def test_search_official_news_filters_by_domain_and_caches(monkeypatch):
+    processor = _processor(monkeypatch, [])
+    processor.search = DummySearch(
+        [
+            SearchResult(title="a", url="https://example.co.jp/news/1"),
+            SearchResult(title="b", url="https://www.example.co.jp/news/2"),
+            SearchResult(title="c", url="https://notexample.co.jp/news/3"),
+            SearchResult(title="d", url=""),
+        ]
+    )
+    first = processor._search_official_news("Example", "example.co.jp")
+    second = processor._search_official_news("Example", "example.co.jp")
+
+    assert [result.title for result in first] == ["a", "b"]
+    assert second == first
+    assert processor.search.calls == 1
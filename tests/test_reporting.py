@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from sales_lead_builder.config import Settings
+from sales_lead_builder.models import SearchResult
+from sales_lead_builder.reporting import ReportGenerator, ReportRequest
+
+
+class FakeBatchClient:
+    def __init__(self, output_lines):
+        self.uploaded = None
+        self._output = "\n".join(json.dumps(line, ensure_ascii=False) for line in output_lines)
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def _create_file(self, file, purpose):
+        self.uploaded = file[1].decode("utf-8")
+        return SimpleNamespace(id="file-in")
+
+    def _file_content(self, file_id):
+        return SimpleNamespace(text=self._output)
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        return SimpleNamespace(id="batch-1", status="in_progress", output_file_id=None)
+
+    def _retrieve_batch(self, batch_id):
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+
+def _report_line(custom_id: str, summary: str) -> dict:
+    content = json.dumps({"business_summary": summary, "business_bullets": ["A"], "recent_news": [], "competitors_hint": []})
+    return {
+        "custom_id": custom_id,
+        "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+    }
+
+
+def test_generate_many_uses_batch_output():
+    settings = Settings(
+        spreadsheet_id="dummy",
+        openai_api_key="sk-test",
+        llm_cache_path=None,
+        llm_batch_poll_interval=0,
+    )
+    generator = ReportGenerator(settings)
+    client = FakeBatchClient(
+        [
+            _report_line("2", "概要2"),
+            {"custom_id": "3", "response": {"status_code": 500, "body": {}}, "error": "boom"},
+        ]
+    )
+    generator._client = client
+
+    requests = {
+        row_id: ReportRequest(
+            company_name=f"Company {row_id}",
+            official_url="https://example.co.jp",
+            content_samples=["会社概要"],
+            news_candidates=[],
+        )
+        for row_id in ("2", "3")
+    }
+    reports = generator.generate_many(requests)
+
+    assert len(client.uploaded.splitlines()) == 2
+    assert set(reports) == {"2"}
+    assert reports["2"].business_summary == "概要2"
+
+
+def test_generate_many_skips_unparsable_output_lines():
+    settings = Settings(
+        spreadsheet_id="dummy",
+        openai_api_key="sk-test",
+        llm_cache_path=None,
+        llm_batch_poll_interval=0,
+    )
+    generator = ReportGenerator(settings)
+    client = FakeBatchClient([_report_line("2", "概要2")])
+    client._output = '{"custom_id": "1", "resp\n' + client._output
+    generator._client = client
+
+    requests = {
+        row_id: ReportRequest(
+            company_name=f"Company {row_id}",
+            official_url="https://example.co.jp",
+            content_samples=["会社概要"],
+            news_candidates=[],
+        )
+        for row_id in ("1", "2")
+    }
+    reports = generator.generate_many(requests)
+
+    assert set(reports) == {"2"}
+
+
+def test_parse_report_skips_malformed_items():
+    content = json.dumps(
+        {
+            "business_summary": " 概要 ",
+            "business_bullets": ["A", None, 3, " B "],
+            "recent_news": [
+                {"date": "2024-01-01", "headline": "発表", "url": "https://example.co.jp/news"},
+                {"date": "2024-01-02", "headline": None, "url": "https://example.co.jp/x"},
+                "not-a-dict",
+            ],
+            "competitors_hint": "not-a-list",
+        }
+    )
+    report = ReportGenerator._parse_report(content)
+    assert report.business_summary == "概要"
+    assert report.business_bullets == ["A", "B"]
+    assert len(report.recent_news) == 1
+    assert report.competitors_hint == []
+
+
+def test_build_prompt_layout():
+    generator = ReportGenerator(Settings(spreadsheet_id="dummy", openai_api_key="sk-test", llm_cache_path=None))
+    prompt = generator._build_prompt(
+        "Example株式会社",
+        "https://example.co.jp",
+        ["  会社概要  ", ""],
+        [SearchResult(title="新製品発表", url="https://example.co.jp/news/1"), SearchResult(title="x", url="")],
+    )
+    assert prompt == (
+        "企業名: Example株式会社\n"
+        "公式サイト: https://example.co.jp\n"
+        "---公式情報---\n"
+        "会社概要\n"
+        "---ニュース候補---\n"
+        "新製品発表\thttps://example.co.jp/news/1\n"
+        "出力はJSONのみ。推測禁止。確証がない場合は配列を空にしてください。"
+    )
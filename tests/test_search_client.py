@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import responses
+
+from sales_lead_builder.config import Settings
+from sales_lead_builder.search_client import SearchClient
+
+
+@responses.activate
+def test_tavily_search_reuses_session_and_sends_auth():
+    responses.post(
+        "https://api.tavily.com/search",
+        json={"results": [{"title": "Example", "url": "https://example.co.jp", "content": "会社概要"}]},
+    )
+    client = SearchClient(Settings(spreadsheet_id="dummy", tavily_api_key="tvly-test", user_agent="test-agent"))
+
+    results = client.search_company("Example株式会社")
+    client.search_company_news("Example株式会社")
+
+    assert [result.url for result in results] == ["https://example.co.jp"]
+    assert results[0].rank == 1
+    assert len(responses.calls) == 2
+    request = responses.calls[0].request
+    assert request.headers["Authorization"] == "Bearer tvly-test"
+    assert request.headers["User-Agent"] == "test-agent"
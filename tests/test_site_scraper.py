@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import responses
 from bs4 import BeautifulSoup
 
+from sales_lead_builder.config import Settings
 from sales_lead_builder.models import PageContent
-from sales_lead_builder.site_scraper import extract_contact_info
+from sales_lead_builder.site_scraper import (
+    PageFetcher,
+    SiteCrawler,
+    _is_role_email,
+    extract_contact_info,
+    extract_page_signals,
+    get_default_fetcher,
+)
+from sales_lead_builder.site_selector import OfficialSiteSelector
 
 
 def _page(url: str, html: str) -> PageContent:
@@ -46,3 +56,176 @@ def test_extract_contact_info_role_email_and_sns():
     assert result.sns["sns_x"].startswith("https://x.com/")
     # ロールメールが取得できた場合は推定メールを追加しない
     assert result.evidence_sources
+    # 抽出後はHTMLと解析ツリーを解放し、本文テキストのみ残す
+    assert all(page.html == "" and page.soup is None and page.text for page in pages)
+
+
+def test_crawler_and_selector_share_default_fetcher():
+    settings = Settings(spreadsheet_id="dummy")
+    crawler = SiteCrawler(settings)
+    selector = OfficialSiteSelector(settings)
+    assert crawler.fetcher is selector.fetcher
+    assert crawler.fetcher is get_default_fetcher(settings)
+
+
+def test_default_fetcher_is_not_shared_across_size_caps():
+    small = Settings(spreadsheet_id="dummy", max_html_bytes=1024)
+    large = Settings(spreadsheet_id="dummy", max_html_bytes=2048)
+    assert get_default_fetcher(small) is not get_default_fetcher(large)
+    assert get_default_fetcher(large).settings.max_html_bytes == 2048
+
+
+class DummyFetcher:
+    def __init__(self, pages):
+        self._pages = pages
+        self.fetched = []
+
+    def fetch(self, url: str):
+        self.fetched.append(url)
+        html = self._pages.get(url)
+        return _page(url, html) if html is not None else None
+
+
+def test_crawl_respects_max_pages_and_stays_on_host():
+    pages = {
+        "https://example.co.jp": """
+            <a href="/about">About</a>
+            <a href="/contact">お問い合わせ</a>
+            <a href="/about#team">Team</a>
+            <a href="https://other.com/">Other</a>
+            <a href="mailto:info@example.co.jp">Mail</a>
+        """,
+        "https://example.co.jp/about": '<a href="/recruit">Recruit</a>',
+        "https://example.co.jp/contact": "<p>TEL 03-1234-5678</p>",
+        "https://example.co.jp/recruit": "<p>Recruit</p>",
+    }
+    settings = Settings(spreadsheet_id="dummy", crawler_max_pages=3, crawler_max_depth=2)
+    fetcher = DummyFetcher(pages)
+    results = SiteCrawler(settings, fetcher=fetcher).crawl("https://example.co.jp")
+
+    urls = [page.url for page in results]
+    assert urls[0] == "https://example.co.jp"
+    assert len(urls) == 3
+    assert "https://example.co.jp/contact" in urls
+    assert all(url.startswith("https://example.co.jp") for url in fetcher.fetched)
+    assert len(fetcher.fetched) == len(set(fetcher.fetched))
+
+
+def test_keyword_regexes_match_like_substring_scans():
+    assert _is_role_email("Customer-Support@example.co.jp")
+    assert _is_role_email("press_room@example.co.jp")
+    assert not _is_role_email("taro.yamada@example.co.jp")
+    page = _page(
+        "https://example.co.jp",
+        '<a href="https://www.facebook.com/example">fb</a><a href="https://twitter.com/example">tw</a>',
+    )
+    assert extract_page_signals(page).sns == {
+        "sns_facebook": "https://www.facebook.com/example",
+        "sns_x": "https://twitter.com/example",
+    }
+
+
+def test_phone_pattern_skips_matches_inside_digit_runs():
+    from sales_lead_builder.site_scraper import PHONE_PATTERN
+
+    assert PHONE_PATTERN.findall("注文番号 12345678901234") == []
+    assert PHONE_PATTERN.findall("TEL:03-1234-5678") == ["03-1234-5678"]
+
+
+def test_extract_phone_fax_uses_nearest_label():
+    from sales_lead_builder.site_scraper import _extract_phone_fax
+
+    text = "TEL 03-1234-5678 FAX 03-9876-5432 受付 06-1111-2222"
+    assert _extract_phone_fax(text) == ("+81312345678", "+81398765432")
+    assert _extract_phone_fax("代表 06-1111-2222") == ("+81611112222", None)
+
+
+def test_normalize_phone_domestic_fast_path_and_fallback():
+    from sales_lead_builder.site_scraper import _normalize_phone
+
+    assert _normalize_phone("090-1234-5678") == "+819012345678"
+    assert _normalize_phone("+81 3-1234-5678") == "+81312345678"
+    assert _normalize_phone("12-34") is None
+
+
+def test_crawl_visits_contact_links_first_and_honours_stop_when():
+    pages = {
+        "https://example.co.jp": """
+            <a href="/about">About</a>
+            <a href="/news">News</a>
+            <a href="/contact">お問い合わせ</a>
+            <a href="/inquiry">Inquiry</a>
+        """,
+        "https://example.co.jp/about": "<p>About</p>",
+        "https://example.co.jp/news": "<p>News</p>",
+        "https://example.co.jp/contact": "<p>TEL 03-1234-5678</p>",
+        "https://example.co.jp/inquiry": "<p>Form</p>",
+    }
+    settings = Settings(spreadsheet_id="dummy", crawler_max_pages=10, crawler_concurrency=1)
+    fetcher = DummyFetcher(pages)
+    SiteCrawler(settings, fetcher=fetcher).crawl("https://example.co.jp")
+    assert fetcher.fetched[1:3] == ["https://example.co.jp/contact", "https://example.co.jp/inquiry"]
+
+    fetcher = DummyFetcher(pages)
+    results = SiteCrawler(settings, fetcher=fetcher).crawl(
+        "https://example.co.jp", stop_when=lambda page: "TEL" in page.text
+    )
+    assert results[-1].url == "https://example.co.jp/contact"
+    assert len(results) == 2
+
+
+def test_pick_best_domain_uses_registrable_domain():
+    from sales_lead_builder.site_scraper import pick_best_domain
+
+    assert pick_best_domain("https://www.example.co.jp/about") == "example.co.jp"
+    assert pick_best_domain("https://shop.example.com") == "example.com"
+
+
+@responses.activate
+def test_fetcher_skips_oversized_and_non_html_responses():
+    responses.get("https://example.co.jp/", body="<p>会社概要</p>".encode("shift_jis"), content_type="text/html")
+    responses.get("https://example.co.jp/big", body="x" * 2048, content_type="text/html")
+    responses.get("https://example.co.jp/brochure.pdf", body=b"%PDF-1.7", content_type="application/pdf")
+    fetcher = PageFetcher(Settings(spreadsheet_id="dummy", max_html_bytes=1024))
+
+    page = fetcher.fetch("https://example.co.jp/")
+    assert page is not None and page.text == "会社概要"
+    assert fetcher.fetch("https://example.co.jp/big") is None
+    assert fetcher.fetch("https://example.co.jp/brochure.pdf") is None
+    assert responses.calls[0].request.headers["Accept"].startswith("text/html")
+
+
+def test_extract_page_signals_collects_everything_in_one_pass():
+    page = _page(
+        "https://example.co.jp/company",
+        """
+        <a href="mailto:Contact@Example.co.jp">お問い合わせ</a>
+        <a href="/inquiry/">資料請求</a>
+        <a href="https://www.instagram.com/example">IG</a>
+        <p>電話番号 06-1234-5678 / sales@example.co.jp</p>
+        """,
+    )
+    signals = extract_page_signals(page)
+    assert signals.contact_link == "https://example.co.jp/inquiry/"
+    assert signals.emails == ["contact@example.co.jp", "sales@example.co.jp"]
+    assert signals.sns == {"sns_instagram": "https://www.instagram.com/example"}
+    assert (signals.phone, signals.fax) == ("+81612345678", None)
+
+
+def test_sns_links_match_by_hostname():
+    page = _page(
+        "https://example.co.jp",
+        """
+        <a href="https://www.netflix.com/title/1">Netflix</a>
+        <a href="https://jp.linkedin.com/jobs/view/1">Jobs</a>
+        <a href="https://jp.linkedin.com/company/example">LinkedIn</a>
+        <a href="https://x.com/example">X</a>
+        <a href="https://twitter.com/example_old">Twitter</a>
+        <a href="https://m.facebook.com/example">FB</a>
+        """,
+    )
+    assert extract_page_signals(page).sns == {
+        "sns_linkedin": "https://jp.linkedin.com/company/example",
+        "sns_x": "https://x.com/example",
+        "sns_facebook": "https://m.facebook.com/example",
+    }
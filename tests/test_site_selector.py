@@ -45,3 +45,15 @@ def test_official_site_selector_prefers_matching_domain(monkeypatch):
     candidate = selector.select("Example株式会社", results)
     assert candidate is not None
     assert candidate.search_result.url == "https://example.co.jp"
+
+
+def test_score_candidate_counts_keywords_in_one_pass():
+    from sales_lead_builder.models import PageContent
+
+    selector = OfficialSiteSelector(Settings(spreadsheet_id="dummy"))
+    page = PageContent(
+        url="https://corp.example.net",
+        html="",
+        text="会社概要 沿革 会社概要 お問い合わせ contact",
+    )
+    assert selector._score_candidate("zzz", page) == 2.5
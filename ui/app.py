@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import codecs
 import json
+import locale
 import os
+import queue
 import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import IO, Dict, List, Optional, Tuple
 
 import streamlit as st
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 CONFIG_PATH = Path(__file__).with_name("settings.json")
+FOOTER_CAPTION = f"保存済み設定ファイル: {CONFIG_PATH}"
+LOG_FLUSH_INTERVAL = 0.2  # seconds between live log re-renders
+PIPE_BUFFER_SIZE = 64 * 1024
+LOG_TAIL_CHARS = 200_000  # characters of output kept in memory and rendered live
+LOG_FILE_PREFIX = "sales_ops_run_"
+LOG_FILES_KEPT = 5  # full logs of truncated runs kept in the temp dir; older ones are removed
+LOG_DOWNLOAD_MAX_BYTES = 20 * 1024 * 1024  # larger logs are only offered by path
 
 ENV_FIELD_GROUPS: List[Tuple[str, List[Tuple[str, str]]]] = [
     (
@@ -29,6 +43,7 @@ ENV_FIELD_GROUPS: List[Tuple[str, List[Tuple[str, str]]]] = [
             ("SALES_LEAD_MAX_SEARCH_RESULTS", "最大検索件数"),
             ("SALES_LEAD_MAX_PAGES", "クローラ最大ページ数"),
             ("SALES_LEAD_MAX_DEPTH", "クローラ最大深さ"),
+            ("SALES_LEAD_MAX_WORKERS", "同時処理行数"),
             ("SALES_LEAD_USER_AGENT", "ユーザーエージェント"),
             ("SALES_LEAD_LLM_MODEL", "LLMモデル名"),
             ("SALES_LEAD_LLM_TEMPERATURE", "LLM温度"),
@@ -83,6 +98,7 @@ DEFAULT_CONFIG: Dict[str, str] = {
     "SALES_LEAD_MAX_SEARCH_RESULTS": "5",
     "SALES_LEAD_MAX_PAGES": "6",
     "SALES_LEAD_MAX_DEPTH": "2",
+    "SALES_LEAD_MAX_WORKERS": "4",
     "SALES_LEAD_LLM_MODEL": "gpt-4o-mini",
     "SALES_LEAD_LLM_TEMPERATURE": "0.1",
     "SALES_LEAD_LLM_TOP_P": "0.9",
@@ -98,133 +114,247 @@ DEFAULT_CONFIG: Dict[str, str] = {
 }
 
 
+try:
+    import orjson
+except ImportError:  # orjson is optional for the UI; fall back to the stdlib encoder.
+    orjson = None
+
+
+def _dumps_config(data: Dict[str, str]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _loads_config(raw: bytes) -> Dict[str, str]:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+# (group, key, label, state_key, input_key, widget_type) per field, flattened once so reruns walk a single tuple.
+_FLAT_FIELDS: Tuple[Tuple[str, str, str, str, str, str], ...] = tuple(
+    (group, key, label, f"env_{key}", f"input_{key}", "password" if key in SENSITIVE_KEYS else "default")
+    for group, fields in ENV_FIELD_GROUPS
+    for key, label in fields
+)
+# Every form field's fallback value, so seeding needs one lookup instead of a chained DEFAULT_CONFIG.get.
+_FIELD_DEFAULTS: Dict[str, str] = {key: DEFAULT_CONFIG.get(key, "") for _, key, *_ in _FLAT_FIELDS}
+
+
+# Widget values meaning "not set" (0 == False == 0.0, so one hash lookup covers unchecked boxes too).
+_EMPTY_PARAM_VALUES = frozenset({"", 0, None})
+
+# (param key, CLI flag, kind) where kind is "int", "str" or "flag" (bare switch when truthy).
+ArgSpec = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class AppSpec:
+    base_cmd: Tuple[str, ...]
+    directory: str
+    src_on_path: bool
+    args: Tuple[ArgSpec, ...]
+
+
+# Apps run as child processes on purpose: they read settings from os.environ (cached per process),
+# depend on cwd and write to stdout, all of which are process-global and shared by every Streamlit session.
+APP_SPECS: Dict[str, AppSpec] = {
+    "companydetail": AppSpec(
+        base_cmd=("python3", "-m", "sales_lead_builder.cli", "run"),
+        directory="companydetail",
+        src_on_path=True,
+        args=(
+            ("row_number", "--row-number", "int"),
+            ("company_name", "--company", "str"),
+            ("limit", "--limit", "int"),
+            ("force", "--force", "flag"),
+            ("dry_run", "--dry-run", "flag"),
+        ),
+    ),
+    "companysearch": AppSpec(
+        base_cmd=("python3", "-m", "companysearch.cli"),
+        directory="companysearch",
+        src_on_path=True,
+        args=(
+            ("query", "--query", "str"),
+            ("log_level", "--log-level", "str"),
+        ),
+    ),
+    "mailsend": AppSpec(
+        base_cmd=("python3", "send_bulk_mail.py"),
+        directory="mailsend",
+        src_on_path=False,
+        args=(
+            ("contacts", "--contacts", "str"),
+            ("defaults", "--defaults", "str"),
+            ("limit", "--limit", "int"),
+            ("subject", "--subject", "str"),
+            ("archive_dir", "--archive-dir", "str"),
+            ("dry_run", "--dry-run", "flag"),
+        ),
+    ),
+}
+
+
 def load_config() -> Dict[str, str]:
+    # Keyed on mtime so reruns reuse the parsed file until it actually changes.
+    mtime = CONFIG_PATH.stat().st_mtime if CONFIG_PATH.exists() else 0.0
+    return _load_config_cached(mtime)
+
+
+@st.cache_data(show_spinner=False)
+def _load_config_cached(mtime: float) -> Dict[str, str]:
     if CONFIG_PATH.exists():
         try:
-            return json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
+            return _loads_config(CONFIG_PATH.read_bytes())
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
             pass
     data = DEFAULT_CONFIG.copy()
-    CONFIG_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    CONFIG_PATH.write_bytes(_dumps_config(data))
     return data
 
 
 def save_config(data: Dict[str, str]) -> None:
-    CONFIG_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    payload = _dumps_config(data)
+    # Leave an unchanged file (and its mtime-keyed cache entry) alone.
+    if CONFIG_PATH.exists() and CONFIG_PATH.read_bytes() == payload:
+        return
+    CONFIG_PATH.write_bytes(payload)
+    _load_config_cached.clear()
 
 
 def initialize_session_state(config: Dict[str, str]) -> None:
-    for group, fields in ENV_FIELD_GROUPS:
-        for key, _ in fields:
-            state_key = f"env_{key}"
-            if state_key not in st.session_state:
-                st.session_state[state_key] = config.get(key, DEFAULT_CONFIG.get(key, ""))
+    # Session state outlives reruns, so seeding is only needed on a session's first run.
+    if st.session_state.get("_env_initialized"):
+        return
+    for _, key, _, state_key, _, _ in _FLAT_FIELDS:
+        if state_key not in st.session_state:
+            st.session_state[state_key] = config.get(key, _FIELD_DEFAULTS[key])
+    st.session_state["_env_initialized"] = True
 
 
-def build_command(app: str, params: Dict[str, str]) -> Tuple[List[str], Path, Dict[str, str]]:
-    env = os.environ.copy()
-    config = load_config()
-    env.update({k: v for k, v in config.items() if v})
+@st.cache_resource(show_spinner=False)
+def _app_dirs() -> Dict[str, Tuple[Path, Optional[str]]]:
+    # (cwd, PYTHONPATH) per app, resolved once per server process; app.py itself re-executes on every rerun.
+    dirs: Dict[str, Tuple[Path, Optional[str]]] = {}
+    for app, spec in APP_SPECS.items():
+        cwd = ROOT_DIR / spec.directory
+        dirs[app] = (cwd, str((cwd / "src").resolve()) if spec.src_on_path else None)
+    return dirs
+
+
+@st.cache_resource(show_spinner=False)
+def _base_env() -> Dict[str, str]:
+    # Snapshot of the server's environment, taken once; callers copy it before layering settings on top.
+    return dict(os.environ)
+
 
-    if app == "companydetail":
-        cmd = ["python3", "-m", "sales_lead_builder.cli", "run"]
-        if params.get("row_number"):
-            cmd += ["--row-number", str(int(params["row_number"]))]
-        if params.get("company_name"):
-            cmd += ["--company", params["company_name"]]
-        if params.get("limit"):
-            cmd += ["--limit", str(int(params["limit"]))]
-        if params.get("force"):
-            cmd.append("--force")
-        if params.get("dry_run"):
-            cmd.append("--dry-run")
-        env["PYTHONPATH"] = str((ROOT_DIR / "companydetail" / "src").resolve())
-        cwd = ROOT_DIR / "companydetail"
-    elif app == "companysearch":
-        cmd = ["python3", "-m", "companysearch.cli"]
-        if params.get("query"):
-            cmd += ["--query", params["query"]]
-        if params.get("log_level"):
-            cmd += ["--log-level", params["log_level"]]
-        env["PYTHONPATH"] = str((ROOT_DIR / "companysearch" / "src").resolve())
-        cwd = ROOT_DIR / "companysearch"
-    elif app == "mailsend":
-        cmd = ["python3", "send_bulk_mail.py"]
-        if params.get("contacts"):
-            cmd += ["--contacts", params["contacts"]]
-        if params.get("defaults"):
-            cmd += ["--defaults", params["defaults"]]
-        if params.get("limit"):
-            cmd += ["--limit", str(int(params["limit"]))]
-        if params.get("subject"):
-            cmd += ["--subject", params["subject"]]
-        if params.get("archive_dir"):
-            cmd += ["--archive-dir", params["archive_dir"]]
-        if params.get("dry_run"):
-            cmd.append("--dry-run")
-        cwd = ROOT_DIR / "mailsend"
-    else:
+def build_command(
+    app: str, params: Dict[str, str], config: Dict[str, str]
+) -> Tuple[List[str], Path, Dict[str, str]]:
+    spec = APP_SPECS.get(app)
+    if spec is None:
         raise ValueError("未対応のアプリです")
+    env = _base_env().copy()
+    env.update({k: v for k, v in config.items() if v})
 
+    cmd = list(spec.base_cmd)
+    for key, flag, kind in spec.args:
+        value = params.get(key)
+        if not value:
+            continue
+        if kind == "flag":
+            cmd.append(flag)
+        elif kind == "int":
+            cmd += [flag, str(int(value))]
+        else:
+            cmd += [flag, value]
+    cwd, pythonpath = _app_dirs()[app]
+    if pythonpath:
+        env["PYTHONPATH"] = pythonpath
     return cmd, cwd, env
 
 
-def run_command(cmd: List[str], cwd: Path, env: Dict[str, str]) -> Tuple[int, str]:
+def _pump_output(stream: Optional[IO[bytes]], chunks: "queue.SimpleQueue[bytes]") -> None:
+    if stream is None:
+        return
+    while chunk := stream.read1(PIPE_BUFFER_SIZE):
+        chunks.put(chunk)
+
+
+def run_command(cmd: List[str], cwd: Path, env: Dict[str, str]) -> Tuple[int, Optional[Path]]:
+    # Returns (exit code, path of the full log); the path is None when the whole log fit on screen.
+    # Block-buffered binary pipe: read1 returns whatever is available, so one syscall covers many lines.
     process = subprocess.Popen(
         cmd,
         cwd=str(cwd),
         env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        bufsize=PIPE_BUFFER_SIZE,
     )
-    output_lines: List[str] = []
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+    # The full log goes to disk; only the last LOG_TAIL_CHARS are kept in memory and rendered.
+    _prune_run_logs()
+    log_file = tempfile.NamedTemporaryFile(prefix=LOG_FILE_PREFIX, suffix=".log", delete=False)
+    tail = ""
+    truncated = False
     placeholder = st.empty()
-    for line in process.stdout or []:
-        output_lines.append(line)
-        placeholder.code("".join(output_lines), language="bash")
+    # A reader thread drains the pipe while this thread renders whatever has arrived every LOG_FLUSH_INTERVAL.
+    chunks: "queue.SimpleQueue[bytes]" = queue.SimpleQueue()
+    reader = threading.Thread(target=_pump_output, args=(process.stdout, chunks), daemon=True)
+    reader.start()
+    with log_file:
+        while reader.is_alive() or not chunks.empty():
+            time.sleep(LOG_FLUSH_INTERVAL)
+            received = []
+            while not chunks.empty():
+                chunk = chunks.get_nowait()
+                log_file.write(chunk)
+                received.append(decoder.decode(chunk))
+            if received:
+                tail, cut = _append_tail(tail, "".join(received))
+                truncated = truncated or cut
+                placeholder.code(tail, language="bash")
+        tail, cut = _append_tail(tail, decoder.decode(b"", final=True))
+    truncated = truncated or cut
     return_code = process.wait()
-    full_output = "".join(output_lines)
-    placeholder.code(full_output or "(出力なし)", language="bash")
-    return return_code, full_output
+    placeholder.code(tail or "(出力なし)", language="bash")
+    log_path = Path(log_file.name)
+    if not truncated:
+        # Everything is already on screen; the full log is only kept when the view was cut.
+        log_path.unlink(missing_ok=True)
+        return return_code, None
+    return return_code, log_path
 
 
-def main() -> None:
-    st.set_page_config(page_title="Sales SaaS Automation UI", layout="wide")
-    config = load_config()
-    initialize_session_state(config)
+def _prune_run_logs() -> None:
+    try:
+        logs = sorted(
+            Path(tempfile.gettempdir()).glob(f"{LOG_FILE_PREFIX}*.log"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in logs[LOG_FILES_KEPT - 1 :]:
+            stale.unlink(missing_ok=True)
+    except OSError:  # another session may be pruning the same directory
+        pass
 
-    st.title("Sales Ops コントロールパネル")
-    st.caption("環境変数の管理と既存CLIアプリの実行をブラウザから行います")
 
-    col1, col2 = st.columns([2, 3])
+def _append_tail(tail: str, text: str) -> Tuple[str, bool]:
+    tail += text
+    if len(tail) <= LOG_TAIL_CHARS:
+        return tail, False
+    return tail[-LOG_TAIL_CHARS:], True
 
-    with col1:
-        st.subheader("環境変数管理")
-        with st.form("env_form"):
-            updated: Dict[str, str] = {}
-            for group, fields in ENV_FIELD_GROUPS:
-                st.markdown(f"**{group}**")
-                for key, label in fields:
-                    value = st.text_input(
-                        label,
-                        value=st.session_state[f"env_{key}"],
-                        key=f"input_{key}",
-                        type="password" if key in SENSITIVE_KEYS else "default",
-                    )
-                    updated[key] = value
-            if st.form_submit_button("保存"):
-                for key, value in updated.items():
-                    st.session_state[f"env_{key}"] = value
-                    config[key] = value
-                save_config(config)
-                st.success("保存しました")
 
-    with col2:
-        st.subheader("アプリ実行")
-        app_choice = st.selectbox("アプリを選択", ["companydetail", "companysearch", "mailsend"])
+@st.fragment
+def render_run_panel(config: Dict[str, str]) -> None:
+    # Runs as a fragment: app switching, 実行 and the live log rerun only this panel, not the env form.
+    st.subheader("アプリ実行")
+    app_choice = st.selectbox("アプリを選択", ["companydetail", "companysearch", "mailsend"])
 
+    # Parameter edits only rerun the panel when 実行 is pressed.
+    with st.form("run_form"):
         run_params: Dict[str, str] = {}
         if app_choice == "companydetail":
             run_params["row_number"] = st.number_input("行番号 (任意)", min_value=0, value=0)
@@ -242,26 +372,61 @@ def main() -> None:
             run_params["subject"] = st.text_input("件名テンプレ (任意)")
             run_params["archive_dir"] = st.text_input("EML保存ディレクトリ (空で無効)", value="outbox")
             run_params["dry_run"] = st.checkbox("dry-run", value=True)
+        submitted = st.form_submit_button("実行")
 
-        if st.button("実行"):
-            filtered_params = {k: v for k, v in run_params.items() if v not in ("", 0, None)}
-            try:
-                cmd, cwd, env = build_command(app_choice, filtered_params)
-            except ValueError as exc:
-                st.error(str(exc))
+    if submitted:
+        filtered_params = {k: v for k, v in run_params.items() if v not in _EMPTY_PARAM_VALUES}
+        try:
+            cmd, cwd, env = build_command(app_choice, filtered_params, config)
+        except ValueError as exc:
+            st.error(str(exc))
+        else:
+            st.info(f"コマンド: {' '.join(cmd)}")
+            with st.spinner("実行中..."):
+                code, log_path = run_command(cmd, cwd, env)
+            if log_path:
+                st.caption(f"表示は末尾のみです。ログ全文: {log_path}")
+                if log_path.stat().st_size <= LOG_DOWNLOAD_MAX_BYTES:
+                    st.download_button("ログ全文をダウンロード", data=log_path.read_bytes(), file_name="run.log")
+            if code == 0:
+                st.success("完了しました。結果はスプレッドシートでご確認ください。")
             else:
-                st.info("コマンド: " + " ".join(cmd))
-                with st.spinner("実行中..."):
-                    code, logs = run_command(cmd, cwd, env)
-                if code == 0:
-                    st.success("完了しました。結果はスプレッドシートでご確認ください。")
-                else:
-                    st.error(f"コマンドが失敗しました (exit {code})")
+                st.error(f"コマンドが失敗しました (exit {code})")
+
+
+def main() -> None:
+    st.set_page_config(page_title="Sales SaaS Automation UI", layout="wide")
+    config = load_config()
+    initialize_session_state(config)
+
+    st.title("Sales Ops コントロールパネル")
+    st.caption("環境変数の管理と既存CLIアプリの実行をブラウザから行います")
+
+    col1, col2 = st.columns([2, 3])
+
+    with col1:
+        st.subheader("環境変数管理")
+        with st.form("env_form"):
+            updated: Dict[str, str] = {}
+            current_group = None
+            for group, key, label, state_key, input_key, widget_type in _FLAT_FIELDS:
+                if group != current_group:
+                    st.markdown(f"**{group}**")
+                    current_group = group
+                updated[key] = st.text_input(
+                    label, value=st.session_state[state_key], key=input_key, type=widget_type
+                )
+            if st.form_submit_button("保存"):
+                st.session_state.update({f"env_{key}": value for key, value in updated.items()})
+                config.update(updated)
+                save_config(config)
+                st.success("保存しました")
+
+    with col2:
+        render_run_panel(config)
 
     st.markdown("---")
-    st.caption(
-        "保存済み設定ファイル: " + str(CONFIG_PATH)
-    )
+    st.caption(FOOTER_CAPTION)
 
 
 if __name__ == "__main__":